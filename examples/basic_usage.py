@@ -28,7 +28,7 @@ def main():
     
     print("\n1. Initializing program with injuries:")
     for body_part, severity in injuries.items():
-        print(f"   - {body_part.value}: {severity.value}")
+        print(f"   - {body_part}: {severity}")
     
     # Step 2: Create program
     program = TaiChiProgram(injuries)
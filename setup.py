@@ -17,6 +17,9 @@ setup(
     package_dir={"": "src"},
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        "speedups": ["numba>=0.57.0", "orjson>=3.6.0"],
+    },
     entry_points={
         "console_scripts": [
             "tai-chi-ai=tai_chi_ai.main:main",
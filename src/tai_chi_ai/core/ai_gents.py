@@ -1,396 +1,848 @@
+import sys
+import time
 from enum import Enum
-from typing import Dict, List, Optional, Any
-import pandas as pd
+from functools import reduce
+from itertools import chain
+from operator import or_
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Any, Tuple
+import numpy as np
 from datetime import datetime
-from ..data.models import BodyPart, InjurySeverity, WorkoutPhase
+from ..data.models import BodyPart, Exercise, ExerciseCategory, InjurySeverity, WorkoutPhase
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Kernel signatures are given as strings so numba compiles them eagerly at
+# import (and caches the result on disk), and the fallback below can ignore them
+try:
+    from numba import njit
+except ImportError:  # numba is an optional speedup
+    def njit(*args, **kwargs):
+        """Fallback that returns the function unchanged when numba is absent"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit("float64(float32[::1])", cache=True, fastmath=True)
+def _sample_std_nb(x):
+    """Sample standard deviation (ddof=1) of a float32 array"""
+    n = x.shape[0]
+    mean = 0.0
+    for i in range(n):
+        mean += float(x[i])
+    mean /= n
+    acc = 0.0
+    for i in range(n):
+        acc += (float(x[i]) - mean) ** 2
+    return (acc / (n - 1)) ** 0.5
+
+
+@njit("float64(float32[::1], float32[::1])", cache=True, fastmath=True)
+def _consistency_nb(completion, duration):
+    """Consistency score from 0-100 for completion and duration windows"""
+    if completion.shape[0] < 2:
+        return 100.0
+    
+    # Lower std deviation = higher consistency
+    completion_consistency = max(0.0, 100.0 - _sample_std_nb(completion) * 10.0)
+    duration_consistency = max(0.0, 100.0 - _sample_std_nb(duration) * 5.0)
+    
+    return (completion_consistency + duration_consistency) / 2.0
+
+
+@njit("int8(float32[::1])", cache=True)
+def _trend_nb(x):
+    """Trend direction of a window: 1 increasing, -1 decreasing, 0 stable"""
+    if x.shape[0] < 2:
+        return 0
+    if x[-1] > x[0] + 0.5:
+        return 1
+    if x[-1] < x[0] - 0.5:
+        return -1
+    return 0
+
+
+@njit("boolean(float64[::1])", cache=True)
+def _monotonic_increasing_nb(x):
+    """True if every value is strictly greater than the one before it"""
+    for i in range(x.shape[0] - 1):
+        if x[i] >= x[i + 1]:
+            return False
+    return True
+
+
+@njit(["boolean(float64[::1], int64)", "boolean(float32[::1], int64)"], cache=True)
+def _all_ge_nb(x, threshold):
+    """True if every value is greater than or equal to ``threshold``"""
+    for i in range(x.shape[0]):
+        if x[i] < threshold:
+            return False
+    return True
+
+
+@njit("boolean(float32[::1], int64)", cache=True)
+def _all_lt_nb(x, threshold):
+    """True if every value is strictly less than ``threshold``"""
+    for i in range(x.shape[0]):
+        if x[i] >= threshold:
+            return False
+    return True
+
+
+_TREND_LABELS = {1: "increasing", -1: "decreasing", 0: "stable"}
+
+# Column layout of ProgressTrackerAgent._metrics
+_METRIC_COLUMNS = ("duration_minutes", "pain_level", "fatigue_level", "completion_percentage")
+_DURATION, _PAIN, _FATIGUE, _COMPLETION = range(len(_METRIC_COLUMNS))
+
+
+def _export_metric(values: np.ndarray) -> np.ndarray:
+    """Metric column for export: int64 when every value is a whole number, else float64"""
+    values = values.astype(np.float64)
+    if np.isfinite(values).all() and (values == np.trunc(values)).all():
+        return values.astype(np.int64)
+    return values
+
+
+# Number of recent sessions SafetyMonitorAgent keeps for trend checks
+_SAFETY_HISTORY_SIZE = 5
+
+
+def _read_only(mapping: Dict) -> MappingProxyType:
+    """Recursively wrap a dict (and nested dicts) in read-only mapping proxies"""
+    return MappingProxyType({
+        key: _read_only(value) if isinstance(value, dict) else value
+        for key, value in mapping.items()
+    })
+
+
+# Static reference data shared by every agent instance. Tuples and read-only
+# mappings keep the tables immutable, so one copy is aliased by all agents and
+# accidental mutation raises instead of leaking between users.
+_PRINCIPLES = ("relaxation", "rooting", "alignment", "flow", "breath control")
+
+_SHOULDER_MODS = {
+    "avoid": ("high arm raises", "shoulder rotations", "weight bearing on arms"),
+    "modify": ("keep arms below shoulder height", "reduce range of motion", "focus on lower body"),
+    "compensatory": ("leg strength", "core stability", "breathing techniques")
+}
+
+_INJURY_MODS = _read_only({
+    BodyPart.LEFT_SHOULDER: _SHOULDER_MODS,
+    BodyPart.RIGHT_SHOULDER: _SHOULDER_MODS,
+    BodyPart.LEFT_CALF: {
+        "avoid": ("deep stances", "jumping", "prolonged standing"),
+        "modify": ("shorter stances", "chair support", "reduced duration"),
+        "compensatory": ("upper body flow", "seated practice", "breathing focus")
+    },
+    BodyPart.LOWER_BACK: {
+        "avoid": ("forward bends", "twisting", "arching"),
+        "modify": ("maintain neutral spine", "bend knees", "use support"),
+        "compensatory": ("gentle core engagement", "postural awareness", "gradual progression")
+    }
+})
+
+_SHOULDER_FOCUS = (
+    "lower body stability and rooting",
+    "deep diaphragmatic breathing",
+    "mental visualization of arm movements"
+)
+
+_FOCUS_AREAS = {
+    BodyPart.LEFT_SHOULDER: _SHOULDER_FOCUS,
+    BodyPart.RIGHT_SHOULDER: _SHOULDER_FOCUS,
+    BodyPart.LEFT_CALF: (
+        "upper body flow and coordination",
+        "seated Tai Chi practice",
+        "breathing techniques for circulation"
+    ),
+    BodyPart.LOWER_BACK: (
+        "core engagement and stabilization",
+        "postural alignment awareness",
+        "gentle weight shifting"
+    )
+}
+
+_REHABILITATION_FOCUS = {
+    BodyPart.LEFT_SHOULDER: "gradual shoulder mobility restoration",
+    BodyPart.RIGHT_SHOULDER: "gradual shoulder mobility restoration",
+    BodyPart.LEFT_CALF: "progressive calf strengthening",
+    BodyPart.LOWER_BACK: "spinal stabilization and core strength"
+}
+
+_PROGRESSION_RULES = _read_only({
+    "phase_duration_weeks": {
+        WorkoutPhase.FOUNDATION: 12,
+        WorkoutPhase.BUILDING: 12,
+        WorkoutPhase.INTEGRATION: 12,
+        WorkoutPhase.MASTERY: 16
+    },
+    "intensity_parameters": {
+        "duration_increment": (5, 10, 15, 20, 25, 30, 35, 40, 45),
+        "complexity_level": ("basic", "simple", "moderate", "advanced", "master"),
+        "frequency_multiplier": (1, 2, 3, 4, 5)
+    }
+})
+
+# Per-phase tables indexed directly by WorkoutPhase (program order)
+_PHASE_FIRST_WEEKS = tuple(
+    1 + sum(_PROGRESSION_RULES["phase_duration_weeks"][earlier] for earlier in WorkoutPhase if earlier < phase)
+    for phase in WorkoutPhase
+)
+
+_PHASE_DURATION_RULES = (  # (base minutes, minutes added per week, start week)
+    (10, 2, 0),
+    (20, 3, 12),
+    (25, 2, 24),
+    (30, 1, 36)
+)
+
+_PHASE_DURATION_TABLE = np.array(_PHASE_DURATION_RULES, dtype=np.int32)
+
+_PHASE_FREQUENCIES = (3, 4, 5, 6)
+
+_PHASE_ENERGY_FOCUS = (
+    "grounding and centering",
+    "flow and coordination",
+    "internal energy circulation",
+    "effortless power and mindfulness"
+)
+
+_EXERCISE_LIBRARY = _read_only({
+    "breathing": {
+        "abdominal_breathing": {
+            "difficulty": 1, 
+            "impact": "low",
+            "description": "Focus on diaphragmatic breathing",
+            "benefits": ("relaxation", "oxygenation", "stress reduction")
+        },
+        "reverse_breathing": {
+            "difficulty": 2, 
+            "impact": "low",
+            "description": "Advanced breathing technique with abdominal control",
+            "benefits": ("energy flow", "core engagement", "mental focus")
+        }
+    },
+    "warmup": {
+        "joint_rotations": {
+            "difficulty": 1, 
+            "impact": "low",
+            "description": "Gentle rotation of all major joints",
+            "benefits": ("mobility", "circulation", "preparation")
+        },
+        "gentle_stretching": {
+            "difficulty": 1, 
+            "impact": "low", 
+            "description": "Light stretching for major muscle groups",
+            "benefits": ("flexibility", "injury prevention", "body awareness")
+        }
+    },
+    "qigong": {
+        "standing_meditation": {
+            "difficulty": 1, 
+            "impact": "low",
+            "description": "Static standing practice with focus on alignment",
+            "benefits": ("rooting", "posture", "mental calm")
+        },
+        "cloud_hands": {
+            "difficulty": 2, 
+            "impact": "medium",
+            "description": "Flowing arm movements with weight shifting",
+            "benefits": ("coordination", "flow", "balance")
+        }
+    },
+    "forms": {
+        "commencement": {
+            "difficulty": 1, 
+            "impact": "low",
+            "description": "Opening movement of Tai Chi forms",
+            "benefits": ("centering", "beginning awareness", "energy gathering")
+        },
+        "ward_off": {
+            "difficulty": 2, 
+            "impact": "medium",
+            "description": "Defensive posture with circular energy",
+            "benefits": ("structure", "warding energy", "upper-lower integration")
+        },
+        "roll_back": {
+            "difficulty": 3, 
+            "impact": "medium",
+            "description": "Yielding backward movement that redirects incoming force",
+            "benefits": ("yielding", "redirection", "waist rotation")
+        },
+        "press": {
+            "difficulty": 3, 
+            "impact": "medium",
+            "description": "Forward press with joined hands from a rooted stance",
+            "benefits": ("rooted power", "forward intent", "arm integration")
+        }
+    }
+})
+
+_KB_SINGLETON = MappingProxyType({
+    "tai_chi_principles": _PRINCIPLES,
+    "injury_modifications": _INJURY_MODS,
+    "progression_rules": _PROGRESSION_RULES
+})
+
+# Injury-class bits used to gate exercise modifications without scanning
+# restriction strings
+_FLAG_SHOULDER = 1 << 0
+_FLAG_CALF = 1 << 1
+_FLAG_BACK = 1 << 2
+
+_BODY_PART_FLAGS = {
+    BodyPart.LEFT_SHOULDER: _FLAG_SHOULDER,
+    BodyPart.RIGHT_SHOULDER: _FLAG_SHOULDER,
+    BodyPart.LEFT_CALF: _FLAG_CALF,
+    BodyPart.LOWER_BACK: _FLAG_BACK
+}
+
+# Which injury classes modify a given exercise, by name and by category
+_EXERCISE_TAGS = {
+    "cloud_hands": _FLAG_SHOULDER,
+    "ward_off": _FLAG_SHOULDER | _FLAG_BACK,
+    "press": _FLAG_BACK
+}
+
+_CATEGORY_TAGS = {
+    "qigong": _FLAG_CALF,
+    "forms": _FLAG_CALF
+}
+
+# Semantic tokens found in restriction text, resolved to bits once at import
+# so workout generation never has to search the strings themselves
+_FLAG_STANDING = 1 << 3
+
+_RESTRICTION_TOKENS = {
+    "shoulder": _FLAG_SHOULDER,
+    "standing": _FLAG_STANDING,
+    "back": _FLAG_BACK
+}
+
+_RESTRICTION_FLAGS = {
+    restriction: sum(flag for token, flag in _RESTRICTION_TOKENS.items() if token in restriction.lower())
+    for mods in _INJURY_MODS.values()
+    for restriction in mods["avoid"]
+}
+
+
+def _freeze_exercise(exercise: Dict[str, Any]) -> MappingProxyType:
+    """Read-only view of an exercise entry that is safe to share between plans"""
+    if isinstance(exercise, MappingProxyType):
+        return exercise
+    if "modifications" in exercise:
+        exercise = {**exercise, "modifications": tuple(exercise["modifications"])}
+    return MappingProxyType(exercise)
+
+
+def _exercise(category: str, name: str, duration: int) -> MappingProxyType:
+    """Read-only exercise template with interned category and name strings"""
+    return MappingProxyType({"category": sys.intern(category), "name": sys.intern(name), "duration": duration})
+
+
+# Exercise templates per phase, indexed directly by WorkoutPhase. Templates are
+# shared by every plan; modified exercises are rebuilt as new dicts.
+_FOUNDATION_EXERCISES = (
+    _exercise("breathing", "abdominal_breathing", 5),
+    _exercise("warmup", "joint_rotations", 5),
+    _exercise("qigong", "standing_meditation", 8),
+    _exercise("qigong", "cloud_hands", 7)
+)
+
+_BUILDING_EXERCISES = (
+    _exercise("breathing", "reverse_breathing", 5),
+    _exercise("warmup", "gentle_stretching", 7),
+    _exercise("qigong", "cloud_hands", 10),
+    _exercise("forms", "commencement", 8),
+    _exercise("forms", "ward_off", 10)
+)
+
+_ADVANCED_EXERCISES = (
+    _exercise("breathing", "reverse_breathing", 5),
+    _exercise("warmup", "gentle_stretching", 7),
+    _exercise("qigong", "cloud_hands", 8),
+    _exercise("forms", "commencement", 5),
+    _exercise("forms", "ward_off", 8),
+    _exercise("forms", "roll_back", 8),
+    _exercise("forms", "press", 8)
+)
+
+_PHASE_EXERCISES = (
+    _FOUNDATION_EXERCISES,
+    _BUILDING_EXERCISES,
+    _ADVANCED_EXERCISES,  # integration
+    _ADVANCED_EXERCISES   # mastery
+)
+
+
+def _catalog_entry(category: str, name: str, entry: MappingProxyType) -> Exercise:
+    """Exercise for a library entry, timed by the earliest phase template that uses it"""
+    duration = next(template["duration"] for template in chain.from_iterable(_PHASE_EXERCISES)
+                    if template["name"] == name)
+    tags = _EXERCISE_TAGS.get(name, 0) | _CATEGORY_TAGS.get(category, 0)
+    return Exercise(
+        name, ExerciseCategory(category), entry["difficulty"], duration, entry["description"],
+        list(entry["benefits"]),
+        # Body parts whose injuries make the coach modify this exercise
+        contraindications=frozenset(part for part, flag in _BODY_PART_FLAGS.items() if tags & flag)
+    )
+
+
+# Shared Exercise per library entry, referenced by name from WorkoutSession.
+# Every exercise in the phase templates has a library entry.
+EXERCISE_CATALOG: Dict[str, Exercise] = {
+    name: _catalog_entry(category, name, entry)
+    for category, exercises in _EXERCISE_LIBRARY.items()
+    for name, entry in exercises.items()
+}
 
 
 class AIAgent:
     """Base class for all AI agents in the Tai Chi system"""
     
+    __slots__ = ("name", "specialty", "knowledge_base")
+    
     def __init__(self, name: str, specialty: str):
         self.name = name
         self.specialty = specialty
-        self.knowledge_base = self._initialize_knowledge_base()
-    
-    def _initialize_knowledge_base(self) -> Dict[str, Any]:
-        return {
-            "tai_chi_principles": ["relaxation", "rooting", "alignment", "flow", "breath control"],
-            "injury_modifications": self._load_injury_modifications(),
-            "progression_rules": self._load_progression_rules()
-        }
-    
-    def _load_injury_modifications(self) -> Dict[BodyPart, Dict]:
-        return {
-            BodyPart.LEFT_SHOULDER: {
-                "avoid": ["high arm raises", "shoulder rotations", "weight bearing on arms"],
-                "modify": ["keep arms below shoulder height", "reduce range of motion", "focus on lower body"],
-                "compensatory": ["leg strength", "core stability", "breathing techniques"]
-            },
-            BodyPart.RIGHT_SHOULDER: {
-                "avoid": ["high arm raises", "shoulder rotations", "weight bearing on arms"],
-                "modify": ["keep arms below shoulder height", "reduce range of motion", "focus on lower body"],
-                "compensatory": ["leg strength", "core stability", "breathing techniques"]
-            },
-            BodyPart.LEFT_CALF: {
-                "avoid": ["deep stances", "jumping", "prolonged standing"],
-                "modify": ["shorter stances", "chair support", "reduced duration"],
-                "compensatory": ["upper body flow", "seated practice", "breathing focus"]
-            },
-            BodyPart.LOWER_BACK: {
-                "avoid": ["forward bends", "twisting", "arching"],
-                "modify": ["maintain neutral spine", "bend knees", "use support"],
-                "compensatory": ["gentle core engagement", "postural awareness", "gradual progression"]
-            }
-        }
-    
-    def _load_progression_rules(self) -> Dict[str, Any]:
-        return {
-            "phase_duration_weeks": {
-                WorkoutPhase.FOUNDATION: 12,
-                WorkoutPhase.BUILDING: 12,
-                WorkoutPhase.INTEGRATION: 12,
-                WorkoutPhase.MASTERY: 16
-            },
-            "intensity_parameters": {
-                "duration_increment": [5, 10, 15, 20, 25, 30, 35, 40, 45],
-                "complexity_level": ["basic", "simple", "moderate", "advanced", "master"],
-                "frequency_multiplier": [1, 2, 3, 4, 5]
-            }
-        }
+        # Read-only and shared by every agent, so there is nothing to build per instance
+        self.knowledge_base = _KB_SINGLETON
 
 
 class TaiChiCoachAgent(AIAgent):
     """AI agent specialized in Tai Chi exercise prescription"""
     
+    __slots__ = ("exercise_library", "_phase_core_cache", "_impact_cache", "_last_key", "_last_impact")
+    
     def __init__(self):
         super().__init__("TaiChi Coach Pro", "Exercise prescription and modification")
         self.exercise_library = self._load_exercise_library()
+        self._phase_core_cache: Dict[Tuple, Tuple] = {}
+        self._impact_cache: Dict[Tuple, Dict[str, Any]] = {}
+        self._last_key: Optional[Tuple] = None
+        self._last_impact: Optional[Dict[str, Any]] = None
     
     def _load_exercise_library(self) -> Dict[str, Dict]:
-        return {
-            "breathing": {
-                "abdominal_breathing": {
-                    "difficulty": 1, 
-                    "impact": "low",
-                    "description": "Focus on diaphragmatic breathing",
-                    "benefits": ["relaxation", "oxygenation", "stress reduction"]
-                },
-                "reverse_breathing": {
-                    "difficulty": 2, 
-                    "impact": "low",
-                    "description": "Advanced breathing technique with abdominal control",
-                    "benefits": ["energy flow", "core engagement", "mental focus"]
-                }
-            },
-            "warmup": {
-                "joint_rotations": {
-                    "difficulty": 1, 
-                    "impact": "low",
-                    "description": "Gentle rotation of all major joints",
-                    "benefits": ["mobility", "circulation", "preparation"]
-                },
-                "gentle_stretching": {
-                    "difficulty": 1, 
-                    "impact": "low", 
-                    "description": "Light stretching for major muscle groups",
-                    "benefits": ["flexibility", "injury prevention", "body awareness"]
-                }
-            },
-            "qigong": {
-                "standing_meditation": {
-                    "difficulty": 1, 
-                    "impact": "low",
-                    "description": "Static standing practice with focus on alignment",
-                    "benefits": ["rooting", "posture", "mental calm"]
-                },
-                "cloud_hands": {
-                    "difficulty": 2, 
-                    "impact": "medium",
-                    "description": "Flowing arm movements with weight shifting",
-                    "benefits": ["coordination", "flow", "balance"]
-                }
-            },
-            "forms": {
-                "commencement": {
-                    "difficulty": 1, 
-                    "impact": "low",
-                    "description": "Opening movement of Tai Chi forms",
-                    "benefits": ["centering", "beginning awareness", "energy gathering"]
-                },
-                "ward_off": {
-                    "difficulty": 2, 
-                    "impact": "medium",
-                    "description": "Defensive posture with circular energy",
-                    "benefits": ["structure", "warding energy", "upper-lower integration"]
-                }
-            }
-        }
+        return _EXERCISE_LIBRARY
     
     def analyze_injury_impact(self, injuries: Dict[BodyPart, InjurySeverity]) -> Dict[str, Any]:
         """Comprehensive analysis of injury impacts on Tai Chi practice"""
-        impact_assessment = {
-            "restrictions": [],
-            "modifications": [],
-            "focus_areas": [],
-            "compensatory_strategies": [],
-            "risk_factors": [],
-            "rehabilitation_focus": []
-        }
+        # Results are memoized and shared between calls, so callers must not
+        # mutate them. The key keeps injury order, which fixes the list order.
+        key = tuple(injuries.items())
+        if key == self._last_key:
+            return self._last_impact
         
-        for body_part, severity in injuries.items():
-            modifications = self.knowledge_base["injury_modifications"][body_part]
-            
+        impact_assessment = self._impact_cache.get(key)
+        if impact_assessment is None:
+            impact_assessment = self._impact_cache[key] = self._build_injury_impact(injuries)
+        
+        self._last_key = key
+        self._last_impact = impact_assessment
+        return impact_assessment
+    
+    def _build_injury_impact(self, injuries: Dict[BodyPart, InjurySeverity]) -> Dict[str, Any]:
+        injury_mods = self.knowledge_base["injury_modifications"]
+        contributions = [
+            (body_part, severity, injury_mods[body_part])
+            for body_part, severity in injuries.items()
+        ]
+        
+        # Bilateral injuries contribute the same entries twice, so each list is
+        # deduplicated in first-seen order (dict.fromkeys) to keep slicing stable
+        impact_assessment = {
             # Add severity-based modifications
-            impact_assessment["restrictions"].extend(
-                f"{restriction} ({severity.value})" 
-                for restriction in modifications["avoid"]
-            )
-            impact_assessment["modifications"].extend(modifications["modify"])
-            impact_assessment["compensatory_strategies"].extend(modifications["compensatory"])
-            
+            "restrictions": list(dict.fromkeys(
+                f"{restriction} ({severity})"
+                for _, severity, mods in contributions
+                for restriction in mods["avoid"]
+            )),
+            "modifications": list(dict.fromkeys(chain.from_iterable(
+                mods["modify"] for _, _, mods in contributions
+            ))),
             # Body part specific focus areas
-            if body_part in [BodyPart.LEFT_SHOULDER, BodyPart.RIGHT_SHOULDER]:
-                impact_assessment["focus_areas"].extend([
-                    "lower body stability and rooting",
-                    "deep diaphragmatic breathing",
-                    "mental visualization of arm movements"
-                ])
-                impact_assessment["rehabilitation_focus"].append("gradual shoulder mobility restoration")
-                
-            elif body_part == BodyPart.LEFT_CALF:
-                impact_assessment["focus_areas"].extend([
-                    "upper body flow and coordination",
-                    "seated Tai Chi practice",
-                    "breathing techniques for circulation"
-                ])
-                impact_assessment["rehabilitation_focus"].append("progressive calf strengthening")
-                
-            elif body_part == BodyPart.LOWER_BACK:
-                impact_assessment["focus_areas"].extend([
-                    "core engagement and stabilization",
-                    "postural alignment awareness",
-                    "gentle weight shifting"
-                ])
-                impact_assessment["rehabilitation_focus"].append("spinal stabilization and core strength")
+            "focus_areas": list(dict.fromkeys(chain.from_iterable(
+                _FOCUS_AREAS.get(body_part, ()) for body_part, _, _ in contributions
+            ))),
+            "compensatory_strategies": list(dict.fromkeys(chain.from_iterable(
+                mods["compensatory"] for _, _, mods in contributions
+            ))),
+            "risk_factors": [],
+            "rehabilitation_focus": list(dict.fromkeys(
+                _REHABILITATION_FOCUS[body_part]
+                for body_part, _, _ in contributions
+                if body_part in _REHABILITATION_FOCUS
+            )),
+            # Identifies the injuries this impact was built from, for plan caching
+            "cache_key": tuple(injuries.items()),
+            "flags": reduce(or_, (_BODY_PART_FLAGS.get(body_part, 0) for body_part, _, _ in contributions), 0),
+            "flag_union": reduce(or_, (
+                _RESTRICTION_FLAGS.get(restriction, 0)
+                for _, _, mods in contributions
+                for restriction in mods["avoid"]
+            ), 0)
+        }
         
         return impact_assessment
     
     def generate_workout_plan(self, phase: WorkoutPhase, injury_impact: Dict, week: int) -> Dict[str, Any]:
-        """Generate comprehensive workout plan for specific phase and week"""
-        workout_template = {
+        """Generate comprehensive workout plan for specific phase and week
+        
+        The exercise entries are shared between calls with the same phase and
+        injuries, so they are returned as read-only mappings.
+        """
+        return self._assemble_plan(phase, week, injury_impact, self._phase_core(phase, injury_impact))
+    
+    def iter_weekly_workouts(self, injury_impact: Dict, start_week: int = 1) -> Iterator[Dict[str, Any]]:
+        """Lazily yield the workout plan for each program week from ``start_week`` on
+        
+        Each plan equals ``generate_workout_plan`` for the phase its week falls in.
+        The phase-level parts are looked up once per phase, so each week only
+        adds its duration.
+        """
+        phase_weeks = self.knowledge_base["progression_rules"]["phase_duration_weeks"]
+        
+        first_week = 1
+        for phase in WorkoutPhase:
+            weeks = range(max(first_week, start_week), first_week + phase_weeks[phase])
+            first_week += phase_weeks[phase]
+            if not weeks:
+                continue
+            
+            core = self._phase_core(phase, injury_impact)
+            for week in weeks:
+                yield self._assemble_plan(phase, week, injury_impact, core)
+    
+    def _assemble_plan(self, phase: WorkoutPhase, week: int, injury_impact: Dict, core: Tuple) -> Dict[str, Any]:
+        """Workout plan for one week from the phase-level parts built by _phase_core"""
+        frequency, exercises, energy_focus = core
+        
+        return {
             "phase": phase,
             "week": week,
             "duration_minutes": self._calculate_optimal_duration(phase, week, injury_impact),
-            "frequency_per_week": self._calculate_frequency(phase, week),
-            "exercises": [],
+            "frequency_per_week": frequency,
+            "exercises": exercises,
             "precautions": injury_impact["restrictions"][:3],
             "modifications": injury_impact["modifications"][:3],
             "focus_points": injury_impact["focus_areas"][:2],
-            "energy_focus": self._get_energy_focus(phase, week)
+            "energy_focus": energy_focus
         }
+    
+    def _phase_core(self, phase: WorkoutPhase, injury_impact: Dict) -> Tuple:
+        """Phase-level plan parts, cached per phase and the injuries the impact was built from"""
+        cache_key = injury_impact.get("cache_key")
+        if cache_key is None:  # not built by analyze_injury_impact
+            return self._build_phase_core(phase, injury_impact)
+        
+        key = (phase, cache_key)
+        core = self._phase_core_cache.get(key)
+        if core is None:
+            core = self._phase_core_cache[key] = self._build_phase_core(phase, injury_impact)
+        return core
+    
+    def _build_phase_core(self, phase: WorkoutPhase, injury_impact: Dict) -> Tuple:
+        """Build the frequency, exercises and energy focus shared by every week of a phase
         
+        The week-taking hooks are called with the first week of the phase.
+        """
+        week = _PHASE_FIRST_WEEKS[phase]
         exercises = self._select_phase_exercises(phase, injury_impact, week)
-        workout_template["exercises"] = self._apply_injury_modifications(exercises, injury_impact)
+        exercises = self._apply_injury_modifications(exercises, injury_impact)
         
-        return workout_template
+        return (
+            self._calculate_frequency(phase, week),
+            tuple(_freeze_exercise(exercise) for exercise in exercises),
+            self._get_energy_focus(phase, week)
+        )
     
     def _calculate_optimal_duration(self, phase: WorkoutPhase, week: int, injury_impact: Dict) -> int:
         """Calculate optimal workout duration based on phase, week, and injuries"""
-        base_durations = {
-            WorkoutPhase.FOUNDATION: 10 + (week * 2),
-            WorkoutPhase.BUILDING: 20 + (max(0, week - 12) * 3),
-            WorkoutPhase.INTEGRATION: 25 + (max(0, week - 24) * 2),
-            WorkoutPhase.MASTERY: 30 + (max(0, week - 36) * 1)
-        }
-        
-        duration = base_durations.get(phase, 15)
+        base, per_week, start_week = _PHASE_DURATION_RULES[phase]
+        duration = base + max(0, week - start_week) * per_week
         
         # Adjust for injuries
-        if any("standing" in restriction for restriction in injury_impact["restrictions"]):
+        if injury_impact["flag_union"] & _FLAG_STANDING:
             duration = max(10, duration - 5)
         
         return min(duration, 60)  # Cap at 60 minutes
     
+    def plan_durations(self, phases: np.ndarray, weeks: np.ndarray, injury_impact: Dict) -> np.ndarray:
+        """Workout durations for many weeks at once, e.g. to preview a full 52-week plan
+        
+        ``phases`` holds ``WorkoutPhase.index`` values aligned with ``weeks``. The
+        result matches ``generate_workout_plan(...)["duration_minutes"]`` per week.
+        """
+        rules = _PHASE_DURATION_TABLE[np.asarray(phases, dtype=np.intp)]
+        weeks = np.asarray(weeks, dtype=np.int32)
+        durations = rules[:, 0] + np.maximum(0, weeks - rules[:, 2]) * rules[:, 1]
+        
+        # Adjust for injuries
+        if injury_impact["flag_union"] & _FLAG_STANDING:
+            durations = np.maximum(10, durations - 5)
+        
+        return np.minimum(durations, 60)  # Cap at 60 minutes
+    
     def _calculate_frequency(self, phase: WorkoutPhase, week: int) -> int:
         """Calculate recommended weekly practice frequency"""
-        frequencies = {
-            WorkoutPhase.FOUNDATION: 3,
-            WorkoutPhase.BUILDING: 4,
-            WorkoutPhase.INTEGRATION: 5,
-            WorkoutPhase.MASTERY: 6
-        }
-        return frequencies.get(phase, 3)
+        return _PHASE_FREQUENCIES[phase]
     
     def _select_phase_exercises(self, phase: WorkoutPhase, injury_impact: Dict, week: int) -> List[Dict]:
         """Select exercises appropriate for the current phase"""
-        exercises = []
-        
-        # Foundation phase exercises
-        if phase == WorkoutPhase.FOUNDATION:
-            exercises = [
-                {"category": "breathing", "name": "abdominal_breathing", "duration": 5},
-                {"category": "warmup", "name": "joint_rotations", "duration": 5},
-                {"category": "qigong", "name": "standing_meditation", "duration": 8},
-                {"category": "qigong", "name": "cloud_hands", "duration": 7}
-            ]
-        
-        # Building phase exercises  
-        elif phase == WorkoutPhase.BUILDING:
-            exercises = [
-                {"category": "breathing", "name": "reverse_breathing", "duration": 5},
-                {"category": "warmup", "name": "gentle_stretching", "duration": 7},
-                {"category": "qigong", "name": "cloud_hands", "duration": 10},
-                {"category": "forms", "name": "commencement", "duration": 8},
-                {"category": "forms", "name": "ward_off", "duration": 10}
-            ]
-        
-        # Integration and Mastery phases
-        else:
-            exercises = [
-                {"category": "breathing", "name": "reverse_breathing", "duration": 5},
-                {"category": "warmup", "name": "gentle_stretching", "duration": 7},
-                {"category": "qigong", "name": "cloud_hands", "duration": 8},
-                {"category": "forms", "name": "commencement", "duration": 5},
-                {"category": "forms", "name": "ward_off", "duration": 8},
-                {"category": "forms", "name": "roll_back", "duration": 8},
-                {"category": "forms", "name": "press", "duration": 8}
-            ]
-        
-        return exercises
+        return list(_PHASE_EXERCISES[phase])
     
     def _apply_injury_modifications(self, exercises: List[Dict], injury_impact: Dict) -> List[Dict]:
         """Apply injury-specific modifications to exercises"""
         modified_exercises = []
         
+        flags = injury_impact["flags"]
+        
         for exercise in exercises:
-            modified_exercise = exercise.copy()
+            applicable = flags & (
+                _EXERCISE_TAGS.get(exercise["name"], 0) | _CATEGORY_TAGS.get(exercise["category"], 0)
+            )
+            if not applicable:
+                modified_exercises.append(exercise)
+                continue
+            
             modifications = []
             
             # Shoulder injury modifications
-            if any("shoulder" in restriction for restriction in injury_impact["restrictions"]):
-                if exercise["name"] in ["cloud_hands", "ward_off"]:
-                    modifications.append("keep arms below shoulder height")
-                    modifications.append("reduce arm movement range by 50%")
-                    modified_exercise["duration"] = max(3, exercise["duration"] - 2)
+            if applicable & _FLAG_SHOULDER:
+                modifications.append("keep arms below shoulder height")
+                modifications.append("reduce arm movement range by 50%")
+                reduction = 2
             
             # Calf injury modifications
-            if any("standing" in restriction for restriction in injury_impact["restrictions"]):
-                if exercise["category"] in ["qigong", "forms"]:
-                    modifications.append("use chair for support if needed")
-                    modifications.append("shorter stance width")
-                    modified_exercise["duration"] = max(3, exercise["duration"] - 3)
+            if applicable & _FLAG_CALF:
+                modifications.append("use chair for support if needed")
+                modifications.append("shorter stance width")
+                reduction = 3
             
             # Back injury modifications
-            if any("back" in restriction.lower() for restriction in injury_impact["restrictions"]):
-                if exercise["name"] in ["ward_off", "press"]:
-                    modifications.append("maintain neutral spine")
-                    modifications.append("engage core throughout movement")
-                    modified_exercise["duration"] = max(3, exercise["duration"] - 2)
+            if applicable & _FLAG_BACK:
+                modifications.append("maintain neutral spine")
+                modifications.append("engage core throughout movement")
+                reduction = 2
             
-            if modifications:
-                modified_exercise["modifications"] = modifications
-            
-            modified_exercises.append(modified_exercise)
+            modified_exercises.append({
+                **exercise,
+                "duration": max(3, exercise["duration"] - reduction),
+                "modifications": modifications
+            })
         
         return modified_exercises
     
     def _get_energy_focus(self, phase: WorkoutPhase, week: int) -> str:
         """Get the energy focus for the workout"""
-        energy_focuses = {
-            WorkoutPhase.FOUNDATION: "grounding and centering",
-            WorkoutPhase.BUILDING: "flow and coordination", 
-            WorkoutPhase.INTEGRATION: "internal energy circulation",
-            WorkoutPhase.MASTERY: "effortless power and mindfulness"
-        }
-        return energy_focuses.get(phase, "mind-body connection")
+        return _PHASE_ENERGY_FOCUS[phase]
 
 
 class ProgressTrackerAgent(AIAgent):
     """AI agent for tracking progress and making adaptations"""
     
-    def __init__(self):
+    __slots__ = (
+        "_n", "_cap", "_timestamp", "_phase", "_notes", "_week", "_metrics",
+        "_mood", "_exercises_completed", "_modifications_used",
+        "_wall_origin_ns", "_monotonic_origin_ns", "_trends_cache"
+    )
+    
+    def __init__(self, initial_capacity: int = 64):
         super().__init__("Progress Tracker Pro", "Analytics and adaptive programming")
-        self.progress_data = pd.DataFrame()
+        # Session history is stored column-wise in preallocated arrays that
+        # double in size when full, so appending a session is amortized O(1)
+        self._n = 0
+        self._cap = max(1, initial_capacity)
+        # Sessions are stamped with time.monotonic_ns(): ordering is all analysis
+        # needs, and wall time is recovered from one origin pair on display
+        self._wall_origin_ns = time.time_ns()
+        self._monotonic_origin_ns = time.monotonic_ns()
+        self._timestamp = np.zeros(self._cap, dtype=np.int64)
+        self._phase = np.empty(self._cap, dtype=object)
+        self._notes = np.empty(self._cap, dtype=object)
+        # Metrics analyzed together, one row per session (see _METRIC_COLUMNS)
+        self._metrics = np.zeros((self._cap, len(_METRIC_COLUMNS)), dtype=np.float32)
+        # Side columns are 64-bit: session dicts are untyped, and narrower types
+        # raise OverflowError (NumPy 2) on values such as week 40000 or mood 200
+        self._week = np.zeros(self._cap, dtype=np.int64)
+        self._mood = np.zeros(self._cap, dtype=np.float64)
+        self._exercises_completed = np.zeros(self._cap, dtype=np.int64)
+        self._modifications_used = np.zeros(self._cap, dtype=np.int64)
+        # analyze_trends results by window size, cleared whenever a session is recorded
+        self._trends_cache: Dict[int, Dict[str, Any]] = {}
+    
+    def _grow(self) -> None:
+        """Double the capacity of every column array"""
+        self._cap *= 2
+        self._timestamp = np.resize(self._timestamp, self._cap)
+        self._phase = np.resize(self._phase, self._cap)
+        self._notes = np.resize(self._notes, self._cap)
+        self._week = np.resize(self._week, self._cap)
+        self._metrics = np.resize(self._metrics, (self._cap, len(_METRIC_COLUMNS)))
+        self._mood = np.resize(self._mood, self._cap)
+        self._exercises_completed = np.resize(self._exercises_completed, self._cap)
+        self._modifications_used = np.resize(self._modifications_used, self._cap)
+    
+    def _ensure_capacity(self, required: int) -> None:
+        """Grow the column arrays until they can hold ``required`` sessions"""
+        while self._cap < required:
+            self._grow()
     
     def record_session(self, session_data: Dict[str, Any]) -> None:
         """Record a complete training session with detailed metrics"""
-        record = {
-            'timestamp': datetime.now(),
-            'phase': session_data['phase'],
-            'week': session_data['week'],
-            'duration_minutes': session_data['duration_minutes'],
-            'pain_level': session_data.get('pain_level', 0),
-            'fatigue_level': session_data.get('fatigue_level', 0),
-            'mood_level': session_data.get('mood_level', 0),
-            'exercises_completed': len(session_data['exercises']),
-            'modifications_used': len(session_data.get('modifications', [])),
-            'completion_percentage': session_data.get('completion_percentage', 100),
-            'notes': session_data.get('notes', '')
-        }
+        if self._n == self._cap:
+            self._grow()
         
-        new_data = pd.DataFrame([record])
-        self.progress_data = pd.concat([self.progress_data, new_data], ignore_index=True)
+        i = self._n
+        self._timestamp[i] = time.monotonic_ns()
+        self._phase[i] = session_data['phase']
+        self._week[i] = session_data['week']
+        self._metrics[i] = (
+            session_data['duration_minutes'],
+            session_data.get('pain_level', 0),
+            session_data.get('fatigue_level', 0),
+            session_data.get('completion_percentage', 100)
+        )
+        self._mood[i] = session_data.get('mood_level', 0)
+        self._exercises_completed[i] = len(session_data.get('exercises', []))
+        self._modifications_used[i] = len(session_data.get('modifications', []))
+        self._notes[i] = session_data.get('notes', '')
+        self._n = i + 1
+        self._trends_cache.clear()
+    
+    def record_sessions(self, sessions: List[Dict[str, Any]]) -> None:
+        """Record many sessions at once, e.g. when importing a historical log"""
+        n = len(sessions)
+        if n == 0:
+            return
+        
+        self._ensure_capacity(self._n + n)
+        batch = slice(self._n, self._n + n)
+        
+        self._timestamp[batch] = time.monotonic_ns()
+        self._phase[batch] = [s['phase'] for s in sessions]
+        self._notes[batch] = [s.get('notes', '') for s in sessions]
+        self._week[batch] = np.fromiter((s['week'] for s in sessions), dtype=np.int64, count=n)
+        self._metrics[batch] = [
+            (
+                s['duration_minutes'],
+                s.get('pain_level', 0),
+                s.get('fatigue_level', 0),
+                s.get('completion_percentage', 100)
+            )
+            for s in sessions
+        ]
+        self._mood[batch] = np.fromiter((s.get('mood_level', 0) for s in sessions), dtype=np.float64, count=n)
+        self._exercises_completed[batch] = np.fromiter(
+            (len(s.get('exercises', [])) for s in sessions), dtype=np.int64, count=n
+        )
+        self._modifications_used[batch] = np.fromiter(
+            (len(s.get('modifications', [])) for s in sessions), dtype=np.int64, count=n
+        )
+        self._n += n
+        self._trends_cache.clear()
+    
+    def timestamp_of(self, index: int) -> datetime:
+        """Local time at which session ``index`` was recorded"""
+        wall_ns = self._wall_origin_ns + int(self._timestamp[index]) - self._monotonic_origin_ns
+        return datetime.fromtimestamp(wall_ns / 1e9)
+    
+    @property
+    def session_count(self) -> int:
+        """Number of sessions recorded so far"""
+        return self._n
+    
+    def session_columns(self) -> Dict[str, np.ndarray]:
+        """Recorded sessions as a mapping of column name to NumPy array"""
+        n = self._n
+        metrics = self._metrics[:n]
+        return {
+            'timestamp': np.array([self.timestamp_of(i) for i in range(n)], dtype=object),
+            'phase': self._phase[:n],
+            'week': self._week[:n],
+            'duration_minutes': _export_metric(metrics[:, _DURATION]),
+            'pain_level': _export_metric(metrics[:, _PAIN]),
+            'fatigue_level': _export_metric(metrics[:, _FATIGUE]),
+            'mood_level': _export_metric(self._mood[:n]),
+            'exercises_completed': self._exercises_completed[:n],
+            'modifications_used': self._modifications_used[:n],
+            'completion_percentage': _export_metric(metrics[:, _COMPLETION]),
+            'notes': self._notes[:n]
+        }
+    
+    @property
+    def progress_data(self) -> "pd.DataFrame":
+        """Recorded sessions as a DataFrame (see ``to_dataframe``)"""
+        return self.to_dataframe()
+    
+    def to_dataframe(self) -> "pd.DataFrame":
+        """Build a DataFrame of all recorded sessions for external consumers"""
+        # pandas is only needed for this export, so it is imported on demand
+        from .reporting import progress_dataframe
+        return progress_dataframe(self)
     
     def analyze_trends(self, window_size: int = 4) -> Dict[str, Any]:
-        """Analyze progress trends over specified window"""
-        if self.progress_data.empty:
+        """Analyze progress trends over specified window
+        
+        The result is reused until the next session is recorded, so callers must
+        not mutate it.
+        """
+        analysis = self._trends_cache.get(window_size)
+        if analysis is None:
+            analysis = self._trends_cache[window_size] = self._build_trend_analysis(window_size)
+        return analysis
+    
+    def _build_trend_analysis(self, window_size: int) -> Dict[str, Any]:
+        if self._n == 0:
             return {"status": "no_data", "recommendations": ["continue_baseline"]}
         
-        recent_data = self.progress_data.tail(window_size)
+        # Transpose the window once so every metric is a contiguous row that the
+        # kernels can take without a per-call copy
+        window = np.ascontiguousarray(self._metrics[max(0, self._n - window_size):self._n].T)
+        means = window.mean(axis=1, dtype=np.float64)
+        duration = window[_DURATION]
+        pain = window[_PAIN]
+        completion = window[_COMPLETION]
         
         analysis = {
             "performance_metrics": {
-                "avg_duration": recent_data['duration_minutes'].mean(),
-                "avg_pain": recent_data['pain_level'].mean(),
-                "avg_fatigue": recent_data['fatigue_level'].mean(),
-                "completion_rate": recent_data['completion_percentage'].mean(),
-                "consistency_score": self._calculate_consistency(recent_data)
+                "avg_duration": float(means[_DURATION]),
+                "avg_pain": float(means[_PAIN]),
+                "avg_fatigue": float(means[_FATIGUE]),
+                "completion_rate": float(means[_COMPLETION]),
+                "consistency_score": self._calculate_consistency(completion, duration)
             },
             "trends": {
-                "pain_trend": self._calculate_trend(recent_data, 'pain_level'),
-                "duration_trend": self._calculate_trend(recent_data, 'duration_minutes'),
-                "completion_trend": self._calculate_trend(recent_data, 'completion_percentage')
+                "pain_trend": self._calculate_trend(pain),
+                "duration_trend": self._calculate_trend(duration),
+                "completion_trend": self._calculate_trend(completion)
             },
-            "recommendations": self._generate_recommendations(recent_data),
-            "risk_factors": self._identify_risk_factors(recent_data)
+            "recommendations": self._generate_recommendations(
+                means[_PAIN], means[_FATIGUE], means[_COMPLETION]
+            ),
+            "risk_factors": self._identify_risk_factors(pain, completion)
         }
         
         return analysis
     
-    def _calculate_consistency(self, data: pd.DataFrame) -> float:
+    def _calculate_consistency(self, completion: np.ndarray, duration: np.ndarray) -> float:
         """Calculate consistency score from 0-100"""
-        if len(data) < 2:
-            return 100.0
-        
-        completion_std = data['completion_percentage'].std()
-        duration_std = data['duration_minutes'].std()
-        
-        # Lower std deviation = higher consistency
-        completion_consistency = max(0, 100 - (completion_std * 10))
-        duration_consistency = max(0, 100 - (duration_std * 5))
-        
-        return (completion_consistency + duration_consistency) / 2
+        return _consistency_nb(
+            np.ascontiguousarray(completion, dtype=np.float32),
+            np.ascontiguousarray(duration, dtype=np.float32)
+        )
     
-    def _calculate_trend(self, data: pd.DataFrame, column: str) -> str:
+    def _calculate_trend(self, values: np.ndarray) -> str:
         """Calculate trend direction for a metric"""
-        if len(data) < 2:
-            return "stable"
-        
-        values = data[column].values
-        if values[-1] > values[0] + 0.5:
-            return "increasing"
-        elif values[-1] < values[0] - 0.5:
-            return "decreasing"
-        else:
-            return "stable"
-    
-    def _generate_recommendations(self, data: pd.DataFrame) -> List[str]:
+        return _TREND_LABELS[_trend_nb(np.ascontiguousarray(values, dtype=np.float32))]
+    
+    def _generate_recommendations(self, avg_pain: float, avg_fatigue: float,
+                                  completion_rate: float) -> List[str]:
         """Generate personalized recommendations based on progress"""
         recommendations = []
-        avg_pain = data['pain_level'].mean()
-        avg_fatigue = data['fatigue_level'].mean()
-        completion_rate = data['completion_percentage'].mean()
         
         if avg_pain > 6:
             recommendations.extend([
@@ -415,17 +867,15 @@ class ProgressTrackerAgent(AIAgent):
         
         return recommendations if recommendations else ["continue_current_program"]
     
-    def _identify_risk_factors(self, data: pd.DataFrame) -> List[str]:
+    def _identify_risk_factors(self, pain: np.ndarray, completion: np.ndarray) -> List[str]:
         """Identify potential risk factors in progress data"""
         risks = []
         
-        if len(data) >= 3:
-            recent_pain = data['pain_level'].tail(3).values
-            if all(pain >= 5 for pain in recent_pain):
+        if len(pain) >= 3:
+            if _all_ge_nb(np.ascontiguousarray(pain[-3:], dtype=np.float32), 5):
                 risks.append("persistent_moderate_pain")
             
-            recent_completion = data['completion_percentage'].tail(3).values
-            if all(completion < 60 for completion in recent_completion):
+            if _all_lt_nb(np.ascontiguousarray(completion[-3:], dtype=np.float32), 60):
                 risks.append("consistent_low_completion")
         
         return risks
@@ -434,6 +884,8 @@ class ProgressTrackerAgent(AIAgent):
 class SafetyMonitorAgent(AIAgent):
     """AI agent dedicated to safety monitoring and injury prevention"""
     
+    __slots__ = ("safety_thresholds", "_pain_ring", "_fatigue_ring", "_hist_idx", "_hist_n")
+    
     def __init__(self):
         super().__init__("Safety Monitor Pro", "Injury prevention and risk management")
         self.safety_thresholds = {
@@ -442,10 +894,93 @@ class SafetyMonitorAgent(AIAgent):
             "fatigue_level_red": 8,   # Rest required
             "completion_minimum": 50  # Minimum acceptable completion rate
         }
-        self.session_history = []
+        # Pain/fatigue of the most recent sessions, kept in fixed-size rings.
+        # float64 holds whatever int or float levels callers pass without
+        # truncation or overflow, so trends match the values as given.
+        self._pain_ring = np.zeros(_SAFETY_HISTORY_SIZE, dtype=np.float64)
+        self._fatigue_ring = np.zeros(_SAFETY_HISTORY_SIZE, dtype=np.float64)
+        self._hist_idx = 0
+        self._hist_n = 0
     
     def assess_session_safety(self, session_data: Dict) -> Dict[str, Any]:
         """Comprehensive safety assessment for a training session"""
+        pain_level = session_data.get('pain_level', 0)
+        fatigue_level = session_data.get('fatigue_level', 0)
+        completion = session_data.get('completion_percentage', 100)
+        
+        # Historical trend analysis
+        self._pain_ring[self._hist_idx] = pain_level
+        self._fatigue_ring[self._hist_idx] = fatigue_level
+        self._hist_idx = (self._hist_idx + 1) % _SAFETY_HISTORY_SIZE
+        self._hist_n = min(self._hist_n + 1, _SAFETY_HISTORY_SIZE)
+        
+        return self._build_safety_report(
+            pain_red=pain_level >= self.safety_thresholds["pain_level_red"],
+            pain_yellow=pain_level >= self.safety_thresholds["pain_level_yellow"],
+            fatigue_red=fatigue_level >= self.safety_thresholds["fatigue_level_red"],
+            low_completion=completion < self.safety_thresholds["completion_minimum"],
+            trend_risks=self._analyze_safety_trends()
+        )
+    
+    def assess_sessions_batch(self, sessions: List[Dict]) -> List[Dict[str, Any]]:
+        """Assess many sessions at once; equivalent to calling assess_session_safety in order"""
+        n = len(sessions)
+        if n == 0:
+            return []
+        
+        pain = np.fromiter((s.get('pain_level', 0) for s in sessions), dtype=np.float64, count=n)
+        fatigue = np.fromiter((s.get('fatigue_level', 0) for s in sessions), dtype=np.float64, count=n)
+        completion = np.fromiter((s.get('completion_percentage', 100) for s in sessions), dtype=np.float64, count=n)
+        
+        # Threshold checks for the whole batch
+        pain_red = pain >= self.safety_thresholds["pain_level_red"]
+        pain_yellow = pain >= self.safety_thresholds["pain_level_yellow"]
+        fatigue_red = fatigue >= self.safety_thresholds["fatigue_level_red"]
+        low_completion = completion < self.safety_thresholds["completion_minimum"]
+        
+        # Trend checks over the stored history followed by the batch; session j's
+        # three-session window ends at position `ends[j]` of the combined series
+        all_pain = np.concatenate((self._ordered_history(self._pain_ring), pain))
+        all_fatigue = np.concatenate((self._ordered_history(self._fatigue_ring), fatigue))
+        
+        ends = np.arange(self._hist_n, self._hist_n + n)
+        has_window = ends >= 2
+        window_ends = ends[has_window]
+        
+        rising = all_pain[1:] > all_pain[:-1]
+        high_fatigue = all_fatigue >= 6
+        increasing_pain = np.zeros(n, dtype=bool)
+        increasing_pain[has_window] = rising[window_ends - 2] & rising[window_ends - 1]
+        persistent_fatigue = np.zeros(n, dtype=bool)
+        persistent_fatigue[has_window] = (
+            high_fatigue[window_ends - 2] & high_fatigue[window_ends - 1] & high_fatigue[window_ends]
+        )
+        
+        # Keep the most recent sessions for subsequent calls
+        recent = slice(max(0, all_pain.size - _SAFETY_HISTORY_SIZE), all_pain.size)
+        kept = all_pain[recent].size
+        self._pain_ring[:kept] = all_pain[recent]
+        self._fatigue_ring[:kept] = all_fatigue[recent]
+        self._hist_idx = kept % _SAFETY_HISTORY_SIZE
+        self._hist_n = kept
+        
+        return [
+            self._build_safety_report(
+                pain_red=pain_red[j],
+                pain_yellow=pain_yellow[j],
+                fatigue_red=fatigue_red[j],
+                low_completion=low_completion[j],
+                trend_risks=(
+                    (["INCREASING_PAIN_TREND"] if increasing_pain[j] else []) +
+                    (["PERSISTENT_HIGH_FATIGUE"] if persistent_fatigue[j] else [])
+                )
+            )
+            for j in range(n)
+        ]
+    
+    def _build_safety_report(self, pain_red: bool, pain_yellow: bool, fatigue_red: bool,
+                             low_completion: bool, trend_risks: List[str]) -> Dict[str, Any]:
+        """Assemble a safety report from the outcome of each threshold check"""
         safety_report = {
             "safety_level": "green",  # green, yellow, red
             "immediate_actions": [],
@@ -454,12 +989,8 @@ class SafetyMonitorAgent(AIAgent):
             "clearance_for_next_session": True
         }
         
-        pain_level = session_data.get('pain_level', 0)
-        fatigue_level = session_data.get('fatigue_level', 0)
-        completion = session_data.get('completion_percentage', 100)
-        
         # Pain assessment
-        if pain_level >= self.safety_thresholds["pain_level_red"]:
+        if pain_red:
             safety_report["safety_level"] = "red"
             safety_report["immediate_actions"].extend([
                 "STOP_ALL_ACTIVITY_IMMEDIATELY",
@@ -468,7 +999,7 @@ class SafetyMonitorAgent(AIAgent):
             ])
             safety_report["clearance_for_next_session"] = False
         
-        elif pain_level >= self.safety_thresholds["pain_level_yellow"]:
+        elif pain_yellow:
             safety_report["safety_level"] = "yellow"
             safety_report["immediate_actions"].extend([
                 "REDUCE_INTENSITY_BY_50_PERCENT",
@@ -477,42 +1008,41 @@ class SafetyMonitorAgent(AIAgent):
             ])
         
         # Fatigue assessment
-        if fatigue_level >= self.safety_thresholds["fatigue_level_red"]:
+        if fatigue_red:
             safety_report["safety_level"] = "red" if safety_report["safety_level"] != "red" else "red"
             safety_report["immediate_actions"].append("REQUIRE_COMPLETE_REST_DAY")
             safety_report["long_term_recommendations"].append("REVIEW_SLEEP_AND_RECOVERY")
         
         # Completion assessment
-        if completion < self.safety_thresholds["completion_minimum"]:
+        if low_completion:
             safety_report["risk_factors"].append("LOW_COMPLETION_RATE")
             safety_report["long_term_recommendations"].append("SIMPLIFY_WORKOUT_COMPLEXITY")
         
-        # Historical trend analysis
-        self.session_history.append(session_data)
-        if len(self.session_history) > 5:
-            self.session_history.pop(0)
-        
-        trend_risks = self._analyze_safety_trends()
         safety_report["risk_factors"].extend(trend_risks)
         
         return safety_report
     
+    def _ordered_history(self, ring: np.ndarray) -> np.ndarray:
+        """Stored values of a history ring, oldest first"""
+        idx = self._hist_idx
+        ordered = np.concatenate((ring[idx:], ring[:idx]))
+        return ordered[_SAFETY_HISTORY_SIZE - self._hist_n:]
+    
     def _analyze_safety_trends(self) -> List[str]:
         """Analyze safety trends across multiple sessions"""
-        if len(self.session_history) < 3:
+        if self._hist_n < 3:
             return []
         
         risks = []
-        recent_sessions = self.session_history[-3:]
         
         # Check for increasing pain trend
-        pain_levels = [s.get('pain_level', 0) for s in recent_sessions]
-        if all(pain_levels[i] < pain_levels[i+1] for i in range(len(pain_levels)-1)):
+        pain_levels = self._ordered_history(self._pain_ring)[-3:]
+        if _monotonic_increasing_nb(pain_levels):
             risks.append("INCREASING_PAIN_TREND")
         
         # Check for persistent high fatigue
-        fatigue_levels = [s.get('fatigue_level', 0) for s in recent_sessions]
-        if all(fatigue >= 6 for fatigue in fatigue_levels):
+        fatigue_levels = self._ordered_history(self._fatigue_ring)[-3:]
+        if _all_ge_nb(fatigue_levels, 6):
             risks.append("PERSISTENT_HIGH_FATIGUE")
         
         return risks
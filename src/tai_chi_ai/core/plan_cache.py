@@ -0,0 +1,95 @@
+"""
+On-disk cache of generated workout plans
+
+A plan is fully determined by its phase, week and injuries, so plans are
+stored as small JSON files and reloaded on later runs instead of being
+regenerated. orjson is used when installed, otherwise the standard json module.
+
+Entries are keyed by the coach class as well, so a subclass that overrides
+any planning hook never shares plans with the base coach. Nothing calls
+cached_workout_plan yet: its intended caller, get_current_workout in
+core/program_manager.py, is not part of this tree.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .ai_agents import TaiChiCoachAgent, _freeze_exercise
+from ..data.models import BodyPart, InjurySeverity, WorkoutPhase
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=dict)
+
+    _loads = orjson.loads
+except ImportError:  # orjson is an optional speedup
+    import json
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=dict).encode("utf-8")
+
+    _loads = json.loads
+
+# Bump when the plan layout or the rules that generate plans change
+_FORMAT_VERSION = 2
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "tai-chi-ai" / "plans"
+
+
+def _plan_path(cache_dir: Path, coach: TaiChiCoachAgent, phase: WorkoutPhase, week: int,
+               injuries: Dict[BodyPart, InjurySeverity]) -> Path:
+    """Cache file for a plan; injury order is part of the key as it fixes list order"""
+    key = (
+        _FORMAT_VERSION,
+        type(coach).__module__,
+        type(coach).__qualname__,
+        int(phase),
+        week,
+        tuple((int(part), int(severity)) for part, severity in injuries.items())
+    )
+    return cache_dir / f"{hashlib.sha1(repr(key).encode()).hexdigest()}.json"
+
+
+def _decode_plan(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Restore the types generate_workout_plan returns from a decoded JSON plan"""
+    data["phase"] = WorkoutPhase(data["phase"])
+    data["exercises"] = tuple(_freeze_exercise(exercise) for exercise in data["exercises"])
+    return data
+
+
+def cached_workout_plan(coach: TaiChiCoachAgent, phase: WorkoutPhase, week: int,
+                        injuries: Dict[BodyPart, InjurySeverity],
+                        cache_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """Workout plan for a phase and week, loaded from the cache when available"""
+    path = _plan_path(Path(cache_dir or DEFAULT_CACHE_DIR), coach, phase, week, injuries)
+    
+    try:
+        return _decode_plan(_loads(path.read_bytes()))
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # missing, unreadable or malformed entry, regenerate it
+    
+    plan = coach.generate_workout_plan(phase, coach.analyze_injury_impact(injuries), week)
+    
+    # Write to a temporary file first so concurrent readers never see a partial plan
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    except OSError:
+        return plan  # caching is best effort, e.g. on a read-only home directory
+    
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_dumps(plan))
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+    
+    return plan
@@ -0,0 +1,16 @@
+"""
+DataFrame exports of agent data for analysis and visualization
+
+pandas is imported here rather than in the agent modules so that it is only
+loaded when a caller actually asks for a DataFrame.
+"""
+
+import pandas as pd
+
+
+def progress_dataframe(tracker) -> pd.DataFrame:
+    """Build a DataFrame of every session recorded by a ProgressTrackerAgent"""
+    if tracker.session_count == 0:
+        return pd.DataFrame()
+    
+    return pd.DataFrame(tracker.session_columns())
@@ -1,10 +1,45 @@
-from enum import Enum
-from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field
+from enum import IntEnum
+from typing import Dict, FrozenSet, List, Literal, Optional, Any, Tuple
+import msgspec
+try:
+    from typing import Annotated
+except ImportError:  # Python 3.8
+    from typing_extensions import Annotated
 from datetime import datetime
 
-
-class BodyPart(str, Enum):
+# Presentation types that only make sense for the integer value, e.g. f"{part:d}"
+_NUMERIC_FORMAT_TYPES = frozenset("bcdoxXneEfFgG%")
+
+
+class _LabelledEnum(IntEnum):
+    """IntEnum declared with display labels; values follow declaration order"""
+    
+    def __new__(cls, label: str):
+        value = len(cls.__members__)
+        member = int.__new__(cls, value)
+        member._value_ = value
+        # Display labels indexed by value, e.g. BodyPart._STR[BodyPart.NECK] == "neck"
+        cls._STR = cls.__dict__.get("_STR", ()) + (label,)
+        return member
+    
+    def __str__(self) -> str:
+        return self._STR[self]
+    
+    def __format__(self, format_spec: str) -> str:
+        # Display the label in f-strings; numeric presentation types format the value
+        if format_spec[-1:] in _NUMERIC_FORMAT_TYPES:
+            return int.__format__(self, format_spec)
+        return format(self._STR[self], format_spec)
+    
+    @classmethod
+    def _missing_(cls, value):
+        # Allow lookup by display label, e.g. BodyPart("left_shoulder")
+        if isinstance(value, str) and value in cls._STR:
+            return cls(cls._STR.index(value))
+        return None
+
+
+class BodyPart(_LabelledEnum):
     LEFT_SHOULDER = "left_shoulder"
     RIGHT_SHOULDER = "right_shoulder"
     LEFT_CALF = "left_calf"
@@ -15,20 +50,30 @@ class BodyPart(str, Enum):
     HIPS = "hips"
 
 
-class InjurySeverity(str, Enum):
+class InjurySeverity(_LabelledEnum):
     MILD = "mild"
     MODERATE = "moderate"
     SEVERE = "severe"
 
 
-class WorkoutPhase(str, Enum):
+# Hashed member sets for O(1) membership tests
+BodyPart._set = frozenset(BodyPart)
+InjurySeverity._set = frozenset(InjurySeverity)
+
+
+class WorkoutPhase(_LabelledEnum):
     FOUNDATION = "foundation"
     BUILDING = "building"
     INTEGRATION = "integration"
     MASTERY = "mastery"
+    
+    @property
+    def index(self) -> int:
+        """Position in program order, usable as a direct index into per-phase tables"""
+        return self._value_
 
 
-class ExerciseCategory(str, Enum):
+class ExerciseCategory(_LabelledEnum):
     BREATHING = "breathing"
     WARMUP = "warmup"
     QIGONG = "qigong"
@@ -36,57 +81,88 @@ class ExerciseCategory(str, Enum):
     COOLDOWN = "cooldown"
 
 
-class Injury(BaseModel):
+# Range constraints are enforced by msgspec.convert/decode at input boundaries;
+# direct construction from program-generated values skips them.
+Difficulty = Annotated[int, msgspec.Meta(ge=1, le=5)]
+ExerciseMinutes = Annotated[int, msgspec.Meta(ge=1, le=30)]
+ProgramWeek = Annotated[int, msgspec.Meta(ge=1, le=52)]
+Level = Annotated[int, msgspec.Meta(ge=0, le=10)]
+Percentage = Annotated[int, msgspec.Meta(ge=0, le=100)]
+
+
+class Injury(msgspec.Struct, frozen=True, gc=False):
     body_part: BodyPart
     severity: InjurySeverity
     description: Optional[str] = None
     date_occurred: Optional[datetime] = None
-    restrictions: List[str] = Field(default_factory=list)
+    restrictions: List[str] = msgspec.field(default_factory=list)
+
+
+# Display labels accepted in configuration files, e.g. "left_shoulder: moderate"
+BodyPartLabel = Literal[BodyPart._STR]
+SeverityLabel = Literal[InjurySeverity._STR]
+
+
+class InjuriesConfig(msgspec.Struct, frozen=True, gc=False, forbid_unknown_fields=True):
+    injuries: Dict[BodyPartLabel, SeverityLabel]
+    
+    def injury_map(self) -> Dict[BodyPart, InjurySeverity]:
+        """Injuries keyed by enum member, in file order"""
+        return {BodyPart(part): InjurySeverity(severity) for part, severity in self.injuries.items()}
 
 
-class Exercise(BaseModel):
+class Exercise(msgspec.Struct, frozen=True, gc=False):
     name: str
     category: ExerciseCategory
-    difficulty: int = Field(ge=1, le=5)
-    duration_minutes: int = Field(ge=1, le=30)
+    difficulty: Difficulty
+    duration_minutes: ExerciseMinutes
     description: str
-    benefits: List[str] = Field(default_factory=list)
-    modifications: List[str] = Field(default_factory=list)
-    contraindications: List[BodyPart] = Field(default_factory=list)
+    benefits: List[str] = msgspec.field(default_factory=list)
+    modifications: List[str] = msgspec.field(default_factory=list)
+    contraindications: FrozenSet[BodyPart] = msgspec.field(default_factory=frozenset)
 
 
-class WorkoutSession(BaseModel):
+class WorkoutSession(msgspec.Struct, frozen=True, gc=False):
     phase: WorkoutPhase
-    week: int = Field(ge=1, le=52)
+    week: ProgramWeek
     duration_minutes: int
-    exercises: List[Exercise]
-    precautions: List[str] = Field(default_factory=list)
-    modifications: List[str] = Field(default_factory=list)
-    focus_points: List[str] = Field(default_factory=list)
+    exercises: Tuple[str, ...]  # names of core.ai_agents.EXERCISE_CATALOG entries
+    precautions: List[str] = msgspec.field(default_factory=list)
+    modifications: List[str] = msgspec.field(default_factory=list)
+    focus_points: List[str] = msgspec.field(default_factory=list)
     energy_focus: str = "mind-body connection"
+    
+    @property
+    def resolved_exercises(self) -> Tuple[Exercise, ...]:
+        """Catalog entries for the exercises in this session"""
+        # The catalog is built from the coach's tables, and that module imports this one
+        from ..core.ai_agents import EXERCISE_CATALOG
+        
+        return tuple(EXERCISE_CATALOG[name] for name in self.exercises)
 
 
-class ProgressMetrics(BaseModel):
+class ProgressMetrics(msgspec.Struct, frozen=True, gc=False):
     timestamp: datetime
-    pain_level: int = Field(ge=0, le=10)
-    fatigue_level: int = Field(ge=0, le=10)
-    mood_level: int = Field(ge=0, le=10)
-    completion_percentage: int = Field(ge=0, le=100)
+    pain_level: Level
+    fatigue_level: Level
+    mood_level: Level
+    completion_percentage: Percentage
     exercises_completed: int
     modifications_used: int
     notes: Optional[str] = None
 
 
-class SafetyAssessment(BaseModel):
+class SafetyAssessment(msgspec.Struct, frozen=True, gc=False):
     safety_level: str  # green, yellow, red
-    immediate_actions: List[str] = Field(default_factory=list)
-    recommendations: List[str] = Field(default_factory=list)
-    risk_factors: List[str] = Field(default_factory=list)
+    immediate_actions: List[str] = msgspec.field(default_factory=list)
+    recommendations: List[str] = msgspec.field(default_factory=list)
+    risk_factors: List[str] = msgspec.field(default_factory=list)
     clearance_given: bool = True
 
 
-class AIAgentConfig(BaseModel):
+# Left GC-tracked: knowledge_base holds arbitrary caller data that may form cycles
+class AIAgentConfig(msgspec.Struct, frozen=True):
     agent_name: str
     specialty: str
-    knowledge_base: Dict[str, Any] = Field(default_factory=dict)
+    knowledge_base: Dict[str, Any] = msgspec.field(default_factory=dict)
     analysis_depth: str = "comprehensive"  # basic, standard, comprehensive
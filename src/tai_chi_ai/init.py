@@ -6,8 +6,16 @@ AI-powered workout program for injury rehabilitation
 __version__ = "1.0.0"
 __author__ = "AI Rehabilitation Team"
 
-from .main import TaiChiProgram
-from .core.ai_agents import TaiChiCoachAgent, ProgressTrackerAgent, SafetyMonitorAgent
+import importlib
+
+# Public names are resolved on first access (PEP 562) so that importing the
+# package, e.g. for the CLI's --help, does not load the agents and NumPy
+_LAZY_ATTRIBUTES = {
+    "TaiChiProgram": ".core.program_manager",
+    "TaiChiCoachAgent": ".core.ai_agents",
+    "ProgressTrackerAgent": ".core.ai_agents",
+    "SafetyMonitorAgent": ".core.ai_agents"
+}
 
 __all__ = [
     "TaiChiProgram",
@@ -15,3 +23,17 @@ __all__ = [
     "ProgressTrackerAgent",
     "SafetyMonitorAgent"
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
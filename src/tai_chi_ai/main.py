@@ -5,17 +5,40 @@ Main entry point for Tai Chi AI Rehabilitation Program
 
 import sys
 import argparse
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional, Tuple
 from datetime import datetime
 
-from .core.ai_agents import TaiChiCoachAgent, ProgressTrackerAgent, SafetyMonitorAgent
-from .core.program_manager import TaiChiProgram
+# The agents pull in NumPy (and numba when installed), so they are imported by
+# the commands that need them rather than at startup
 from .data.models import BodyPart, InjurySeverity
 from .utils.logger import setup_logger
-from .utils.config_loader import load_config
 
 logger = setup_logger(__name__)
 
+# Menu choices for collect_injury_info, in menu order ("1" selects entry 0)
+BODY_PART_TABLE = (
+    BodyPart.LEFT_SHOULDER,
+    BodyPart.RIGHT_SHOULDER,
+    BodyPart.LEFT_CALF,
+    BodyPart.RIGHT_CALF,
+    BodyPart.LOWER_BACK,
+    BodyPart.UPPER_BACK,
+    BodyPart.NECK,
+    BodyPart.HIPS
+)
+
+SEVERITY_TABLE = (
+    InjurySeverity.MILD,
+    InjurySeverity.MODERATE,
+    InjurySeverity.SEVERE
+)
+
+
+def _menu_choice(table: tuple, choice: str):
+    """Entry selected by a one-digit menu choice, or None if it is not on the menu"""
+    index = ord(choice) - 49 if len(choice) == 1 else -1  # 49 == ord("1")
+    return table[index] if 0 <= index < len(table) else None
+
 
 def main():
     """Main command line interface for the Tai Chi AI program"""
@@ -80,7 +103,10 @@ Examples:
 
 def run_demonstration():
     """Run a demonstration of the AI Tai Chi program"""
-    print("=== Tai Chi AI Rehabilitation Program Demo ===")
+    from .core.program_manager import TaiChiProgram
+    
+    # Output is buffered and written once instead of flushing line by line
+    out = ["=== Tai Chi AI Rehabilitation Program Demo ==="]
     
     # Define sample injuries
     injuries = {
@@ -93,31 +119,33 @@ def run_demonstration():
     # Initialize program
     program = TaiChiProgram(injuries)
     
-    print("\n🤖 AI Agents Initialized:")
-    print(f"   - {program.coach_agent.name}")
-    print(f"   - {program.tracker_agent.name}") 
-    print(f"   - {program.safety_agent.name}")
+    out.append("\n🤖 AI Agents Initialized:")
+    out.append(f"   - {program.coach_agent.name}")
+    out.append(f"   - {program.tracker_agent.name}") 
+    out.append(f"   - {program.safety_agent.name}")
     
-    print("\n🏥 Injury Analysis Complete:")
-    for body_part, severity in injuries.items():
-        print(f"   - {body_part.value}: {severity.value}")
+    out.append("\n🏥 Injury Analysis Complete:")
+    out.append("\n".join(
+        f"   - {body_part}: {severity}"
+        for body_part, severity in injuries.items()
+    ))
     
-    print("\n📋 Initial Workout Plan:")
+    out.append("\n📋 Initial Workout Plan:")
     workout = program.get_current_workout()
-    print(f"   Phase: {workout['phase']}")
-    print(f"   Duration: {workout['duration_minutes']} minutes")
-    print(f"   Focus: {workout['energy_focus']}")
+    out.append(f"   Phase: {workout['phase']}")
+    out.append(f"   Duration: {workout['duration_minutes']} minutes")
+    out.append(f"   Focus: {workout['energy_focus']}")
     
     # Simulate some training sessions
-    print("\n🔄 Simulating 4 weeks of training...")
+    out.append("\n🔄 Simulating 4 weeks of training...")
     for week in range(1, 5):
-        print(f"\n--- Week {week} ---")
+        out.append(f"\n--- Week {week} ---")
         
         # Simulate decreasing pain levels
         pain_level = max(0, 5 - week)
         fatigue_level = max(0, 4 - week // 2)
         
-        print(f"Session completed with pain level: {pain_level}/10")
+        out.append(f"Session completed with pain level: {pain_level}/10")
         program.complete_session(
             pain_level=pain_level,
             fatigue_level=fatigue_level,
@@ -125,27 +153,32 @@ def run_demonstration():
         )
     
     # Generate final report
-    print("\n📊 Progress Report:")
     report = program.get_progress_report()
-    print(f"Current Week: {report['current_week']}")
-    print(f"Phase: {report['current_phase']}")
-    print(f"Injury Status: {report['injury_status']['status']}")
-    print(f"Recommendation: {report['progress_analysis']['recommendations'][0]}")
+    out.append(_format_report(report, "\n📊 Progress Report:", f"Current Week: {report['current_week']}"))
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def run_with_config(config_path: str, start_week: int, pain_level: Optional[int]):
     """Run program with configuration file"""
+    from .utils.config_loader import load_injuries
+    
     print(f"Loading configuration from {config_path}")
-    # Implementation for config-based execution
-    pass
+    injuries = load_injuries(config_path).injury_map()
+    print(f"Loaded {len(injuries)} injuries")
 
 
 def run_interactive_mode():
     """Run program in interactive mode"""
+    from .core.program_manager import TaiChiProgram
+    
     print("=== Tai Chi AI Rehabilitation - Interactive Mode ===")
     
+    # Scripted runs (stdin redirected from a file or pipe) are read in one go
+    read_line = input if sys.stdin.isatty() else _scripted_input(sys.stdin)
+    
     # Collect injury information
-    injuries = collect_injury_info()
+    injuries = collect_injury_info(read_line)
     
     # Initialize program
     program = TaiChiProgram(injuries)
@@ -153,87 +186,80 @@ def run_interactive_mode():
     print("\n✅ Program initialized successfully!")
     print("Your personalized 12-month Tai Chi journey begins now...")
     
-    # Main training loop
-    while program.current_week <= 52:
-        run_weekly_session(program)
+    # Main training loop, one plan per remaining program week
+    coach = program.coach_agent
+    for workout in coach.iter_weekly_workouts(coach.analyze_injury_impact(injuries), program.current_week):
+        run_weekly_session(program, workout, read_line)
 
 
-def collect_injury_info() -> Dict[BodyPart, InjurySeverity]:
+def _scripted_input(stream) -> Callable[[str], str]:
+    """input() replacement serving lines from a single bulk read of ``stream``"""
+    lines = iter(stream.read().splitlines())
+    
+    def read_line(prompt: str = "") -> str:
+        sys.stdout.write(prompt)
+        try:
+            return next(lines)
+        except StopIteration:
+            raise EOFError("EOF when reading a line") from None
+    
+    return read_line
+
+
+def collect_injury_info(read_line: Callable[[str], str] = input) -> Dict[BodyPart, InjurySeverity]:
     """Collect injury information from user"""
     injuries = {}
     
     print("\nPlease describe your injuries (enter 'done' when finished):")
     
-    body_part_mapping = {
-        "1": BodyPart.LEFT_SHOULDER,
-        "2": BodyPart.RIGHT_SHOULDER, 
-        "3": BodyPart.LEFT_CALF,
-        "4": BodyPart.RIGHT_CALF,
-        "5": BodyPart.LOWER_BACK,
-        "6": BodyPart.UPPER_BACK,
-        "7": BodyPart.NECK,
-        "8": BodyPart.HIPS
-    }
-    
-    severity_mapping = {
-        "1": InjurySeverity.MILD,
-        "2": InjurySeverity.MODERATE, 
-        "3": InjurySeverity.SEVERE
-    }
-    
     while True:
         print("\nAvailable body parts:")
-        for key, part in body_part_mapping.items():
-            print(f"  {key}. {part.value}")
+        for key, part in enumerate(BODY_PART_TABLE, 1):
+            print(f"  {key}. {part}")
         
-        body_choice = input("\nSelect body part (or 'done'): ").strip()
+        body_choice = read_line("\nSelect body part (or 'done'): ").strip()
         if body_choice.lower() == 'done':
             break
             
-        if body_choice not in body_part_mapping:
+        body_part = _menu_choice(BODY_PART_TABLE, body_choice)
+        if body_part is None:
             print("Invalid selection. Please try again.")
             continue
-            
-        body_part = body_part_mapping[body_choice]
         
         print("\nSeverity levels:")
-        for key, severity in severity_mapping.items():
-            print(f"  {key}. {severity.value}")
+        for key, severity in enumerate(SEVERITY_TABLE, 1):
+            print(f"  {key}. {severity}")
             
-        severity_choice = input("Select severity: ").strip()
-        if severity_choice not in severity_mapping:
+        severity_choice = read_line("Select severity: ").strip()
+        severity = _menu_choice(SEVERITY_TABLE, severity_choice)
+        if severity is None:
             print("Invalid severity. Please try again.")
             continue
             
-        severity = severity_mapping[severity_choice]
         injuries[body_part] = severity
         
-        print(f"✅ Added {body_part.value} ({severity.value})")
+        print(f"✅ Added {body_part} ({severity})")
     
     return injuries
 
 
-def run_weekly_session(program):
+def run_weekly_session(program, workout: Dict, read_line: Callable[[str], str] = input):
     """Run a single weekly training session"""
-    workout = program.get_current_workout()
-    
-    print(f"\n🎯 Week {program.current_week} - {workout['phase'].title()} Phase")
+    print(f"\n🎯 Week {workout['week']} - {str(workout['phase']).title()} Phase")
     print(f"Duration: {workout['duration_minutes']} minutes")
     print(f"Focus: {workout['energy_focus']}")
     
-    print("\nExercises:")
-    for i, exercise in enumerate(workout['exercises'], 1):
-        mod_text = f" (Modifications: {', '.join(exercise.get('modifications', []))})" 
-        print(f"  {i}. {exercise['name']}: {exercise['duration']} min{mod_text}")
+    print("\nExercises:\n" + "\n".join(
+        f"  {i}. {exercise['name']}: {exercise['duration']} min"
+        f" (Modifications: {', '.join(exercise.get('modifications', []))})"
+        for i, exercise in enumerate(workout['exercises'], 1)
+    ))
     
     # Collect session feedback
     print("\nAfter completing your session, please provide feedback:")
     
     try:
-        pain_level = int(input("Pain level (0-10, where 0 is no pain): "))
-        fatigue_level = int(input("Fatigue level (0-10): "))
-        completion = int(input("Completion percentage (0-100): "))
-        notes = input("Any notes or observations: ")
+        pain_level, fatigue_level, completion, notes = _read_session_feedback(read_line)
         
         program.complete_session(
             pain_level=pain_level,
@@ -244,27 +270,52 @@ def run_weekly_session(program):
         
         # Show progress report
         if program.current_week % 4 == 0:
-            show_ monthly_report(program)
+            show_monthly_report(program)
             
-    except ValueError:
-        print("Invalid input. Please enter numbers for pain, fatigue, and completion.")
     except KeyboardInterrupt:
         print("\n\nSession interrupted. Progress saved.")
         sys.exit(0)
 
 
+def _read_session_feedback(read_line: Callable[[str], str]) -> Tuple[int, int, int, str]:
+    """Prompt for session feedback until it is valid, so a mistyped answer never skips a week"""
+    while True:
+        try:
+            pain_level = int(read_line("Pain level (0-10, where 0 is no pain): "))
+            fatigue_level = int(read_line("Fatigue level (0-10): "))
+            completion = int(read_line("Completion percentage (0-100): "))
+            notes = read_line("Any notes or observations: ")
+            
+            # User input is untrusted; everything downstream constructs models unchecked
+            if not (0 <= pain_level <= 10 and 0 <= fatigue_level <= 10 and 0 <= completion <= 100):
+                raise ValueError("Session feedback out of range")
+            
+            return pain_level, fatigue_level, completion, notes
+        except ValueError:
+            print("Invalid input. Please enter numbers for pain, fatigue, and completion.")
+
+
 def show_monthly_report(program):
     """Show monthly progress report"""
     report = program.get_progress_report()
+    header = "\n📈 Monthly Progress Report\n" + "=" * 40
+    sys.stdout.write(_format_report(report, header, f"Month: {program.current_week // 4}") + "\n")
+
+
+def _format_report(report: Dict, header: str, *details: str) -> str:
+    """Format a progress report as one string so callers can print or buffer it"""
+    lines = [
+        header,
+        *details,
+        f"Phase: {report['current_phase']}",
+        f"Injury Status: {report['injury_status']['status']}"
+    ]
     
-    print("\n📈 Monthly Progress Report")
-    print("=" * 40)
-    print(f"Month: {program.current_week // 4}")
-    print(f"Phase: {report['current_phase']}")
-    print(f"Injury Status: {report['injury_status']['status']}")
+    recommendations = report['progress_analysis']['recommendations']
+    if recommendations:
+        lines.append(f"AI Recommendation: {recommendations[0]}")
     
-    if report['progress_analysis']['recommendations']:
-        print(f"AI Recommendation: {report['progress_analysis']['recommendations'][0]}")
+    return "\n".join(lines)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+"""
+YAML configuration loading
+
+Parsed files are kept in a small LRU cache keyed by absolute path and
+revalidated against the file's mtime and size on every load. Injury
+configurations are validated against the msgspec schema in data.models.
+"""
+
+import copy
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+import msgspec
+import yaml
+
+from ..data.models import InjuriesConfig
+
+try:
+    _Loader = yaml.CSafeLoader
+except AttributeError:  # PyYAML built without libyaml
+    _Loader = yaml.SafeLoader
+
+_CACHE_SIZE = 100
+_cache: "OrderedDict[str, Tuple[int, int, Dict[str, Any]]]" = OrderedDict()
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    """Load a YAML configuration file, reusing the parsed result while the file is unchanged"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        _cache.move_to_end(path)
+        return copy.deepcopy(cached[2])
+    
+    with open(path, "r", encoding="utf-8") as f:
+        config = yaml.load(f, Loader=_Loader) or {}
+    
+    _cache[path] = (stat.st_mtime_ns, stat.st_size, config)
+    _cache.move_to_end(path)
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    
+    # Callers may mutate the result, so never hand out the cached object
+    return copy.deepcopy(config)
+
+
+def clear_config_cache() -> None:
+    """Drop all cached configuration files"""
+    _cache.clear()
+
+
+def load_injuries(path: str) -> InjuriesConfig:
+    """Load and validate an injuries configuration from a YAML or JSON file"""
+    if path.endswith(".json"):
+        with open(path, "rb") as f:
+            return msgspec.json.decode(f.read(), type=InjuriesConfig)
+    
+    return msgspec.convert(load_config(path), InjuriesConfig)
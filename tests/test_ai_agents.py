@@ -1,38 +1,74 @@
+import os
 import pytest
 import pandas as pd
 from datetime import datetime
 
-from src.tai_chi_ai.core.ai_agents import TaiChiCoachAgent, ProgressTrackerAgent, SafetyMonitorAgent
-from src.tai_chi_ai.data.models import BodyPart, InjurySeverity, WorkoutPhase
+from src.tai_chi_ai.core.ai_agents import EXERCISE_CATALOG, TaiChiCoachAgent, ProgressTrackerAgent, SafetyMonitorAgent
+from src.tai_chi_ai.core.plan_cache import cached_workout_plan
+from src.tai_chi_ai.data.models import BodyPart, InjurySeverity, WorkoutPhase, WorkoutSession
+
+
+# The coach only keeps caches between calls, so one instance serves every test.
+# Trackers and safety monitors accumulate session history, so each test gets its own.
+@pytest.fixture(scope="session")
+def coach_agent():
+    return TaiChiCoachAgent()
+
+
+@pytest.fixture
+def tracker():
+    return ProgressTrackerAgent()
+
+
+@pytest.fixture
+def safety_monitor():
+    return SafetyMonitorAgent()
 
 
 class TestTaiChiCoachAgent:
-    def test_agent_initialization(self):
-        agent = TaiChiCoachAgent()
-        assert agent.name == "TaiChi Coach Pro"
-        assert agent.specialty == "Exercise prescription and modification"
-        assert "tai_chi_principles" in agent.knowledge_base
+    def test_agent_initialization(self, coach_agent):
+        assert coach_agent.name == "TaiChi Coach Pro"
+        assert coach_agent.specialty == "Exercise prescription and modification"
+        assert "tai_chi_principles" in coach_agent.knowledge_base
     
-    def test_injury_impact_analysis(self):
-        agent = TaiChiCoachAgent()
+    def test_injury_impact_analysis(self, coach_agent):
         injuries = {
             BodyPart.LEFT_SHOULDER: InjurySeverity.MODERATE,
             BodyPart.LOWER_BACK: InjurySeverity.MILD
         }
         
-        impact = agent.analyze_injury_impact(injuries)
+        impact = coach_agent.analyze_injury_impact(injuries)
         
         assert "restrictions" in impact
         assert "modifications" in impact
         assert "focus_areas" in impact
         assert len(impact["restrictions"]) > 0
+
+    def test_bilateral_injury_impact_has_no_duplicates(self, coach_agent):
+        injuries = {
+            BodyPart.LEFT_SHOULDER: InjurySeverity.MILD,
+            BodyPart.RIGHT_SHOULDER: InjurySeverity.MILD
+        }
+
+        impact = coach_agent.analyze_injury_impact(injuries)
+
+        for key in ("restrictions", "modifications", "focus_areas", "rehabilitation_focus"):
+            assert len(impact[key]) == len(set(impact[key]))
     
-    def test_workout_generation(self):
-        agent = TaiChiCoachAgent()
+    def test_repeated_injury_impact_is_cached(self, coach_agent):
+        injuries = {BodyPart.LEFT_SHOULDER: InjurySeverity.MILD, BodyPart.LOWER_BACK: InjurySeverity.SEVERE}
+
+        first = coach_agent.analyze_injury_impact(injuries)
+        coach_agent.analyze_injury_impact({BodyPart.LEFT_CALF: InjurySeverity.MILD})
+
+        assert coach_agent.analyze_injury_impact(dict(injuries)) is first
+        assert coach_agent.analyze_injury_impact({BodyPart.LOWER_BACK: InjurySeverity.SEVERE}) is not first
+    
+    def test_workout_generation(self, coach_agent):
         injuries = {BodyPart.LEFT_SHOULDER: InjurySeverity.MILD}
-        impact = agent.analyze_injury_impact(injuries)
+        impact = coach_agent.analyze_injury_impact(injuries)
         
-        workout = agent.generate_workout_plan(
+        workout = coach_agent.generate_workout_plan(
             WorkoutPhase.FOUNDATION, 
             impact, 
             week=1
@@ -43,10 +79,164 @@ class TestTaiChiCoachAgent:
         assert "exercises" in workout
         assert len(workout["exercises"]) > 0
 
+    def test_back_injury_modifies_forms(self, coach_agent):
+        impact = coach_agent.analyze_injury_impact({BodyPart.LOWER_BACK: InjurySeverity.MILD})
+
+        workout = coach_agent.generate_workout_plan(WorkoutPhase.INTEGRATION, impact, week=30)
+        exercises = {exercise["name"]: exercise for exercise in workout["exercises"]}
+
+        assert "maintain neutral spine" in exercises["press"]["modifications"]
+        assert "modifications" not in exercises["cloud_hands"]
+
+    def test_repeated_workout_generation_is_cached(self, coach_agent):
+        impact = coach_agent.analyze_injury_impact({BodyPart.LEFT_CALF: InjurySeverity.MODERATE})
+
+        first = coach_agent.generate_workout_plan(WorkoutPhase.BUILDING, impact, week=14)
+        second = coach_agent.generate_workout_plan(WorkoutPhase.BUILDING, impact, week=14)
+
+        assert first == second
+        assert first["exercises"] is second["exercises"]
+        with pytest.raises(TypeError):
+            first["exercises"][0]["duration"] = 60
+
+    def test_plan_durations_match_weekly_plans(self, coach_agent):
+        impact = coach_agent.analyze_injury_impact({BodyPart.LEFT_CALF: InjurySeverity.MILD})
+        schedule = [WorkoutPhase.FOUNDATION] * 12 + [WorkoutPhase.BUILDING] * 12 + \
+            [WorkoutPhase.INTEGRATION] * 12 + [WorkoutPhase.MASTERY] * 16
+        weeks = list(range(1, 53))
+
+        durations = coach_agent.plan_durations([phase.index for phase in schedule], weeks, impact)
+
+        expected = [
+            coach_agent.generate_workout_plan(phase, impact, week)["duration_minutes"]
+            for phase, week in zip(schedule, weeks)
+        ]
+        assert durations.tolist() == expected
+
+    def test_weekly_workouts_match_weekly_plans(self, coach_agent):
+        impact = coach_agent.analyze_injury_impact({BodyPart.LOWER_BACK: InjurySeverity.MODERATE})
+        schedule = [WorkoutPhase.FOUNDATION] * 12 + [WorkoutPhase.BUILDING] * 12 + \
+            [WorkoutPhase.INTEGRATION] * 12 + [WorkoutPhase.MASTERY] * 16
+
+        workouts = list(coach_agent.iter_weekly_workouts(impact, start_week=10))
+
+        expected = [
+            coach_agent.generate_workout_plan(phase, impact, week)
+            for week, phase in enumerate(schedule, 1)
+            if week >= 10
+        ]
+        assert workouts == expected
+
+    def test_overridden_hooks_receive_the_injury_impact(self):
+        class SeverityAwareCoach(TaiChiCoachAgent):
+            def _calculate_optimal_duration(self, phase, week, injury_impact):
+                return 30 if any("(severe)" in r for r in injury_impact["restrictions"]) else 20
+
+        coach = SeverityAwareCoach()
+        mild = coach.analyze_injury_impact({BodyPart.LOWER_BACK: InjurySeverity.MILD})
+        severe = coach.analyze_injury_impact({BodyPart.LOWER_BACK: InjurySeverity.SEVERE})
+
+        assert coach.generate_workout_plan(WorkoutPhase.BUILDING, mild, 14)["duration_minutes"] == 20
+        assert coach.generate_workout_plan(WorkoutPhase.BUILDING, severe, 14)["duration_minutes"] == 30
+
+    def test_weekly_workouts_use_overridden_duration(self):
+        class FixedDurationCoach(TaiChiCoachAgent):
+            def _calculate_optimal_duration(self, phase, week, injury_impact):
+                return 42
+
+        coach = FixedDurationCoach()
+        impact = coach.analyze_injury_impact({})
+
+        assert {plan["duration_minutes"] for plan in coach.iter_weekly_workouts(impact)} == {42}
+
+    def test_weekly_workouts_build_each_phase_once(self):
+        class CountingCoach(TaiChiCoachAgent):
+            __slots__ = ("builds",)
+
+            def _build_phase_core(self, phase, injury_impact):
+                self.builds.append(phase)
+                return super()._build_phase_core(phase, injury_impact)
+
+        coach = CountingCoach()
+        coach.builds = []
+        impact = coach.analyze_injury_impact({BodyPart.RIGHT_SHOULDER: InjurySeverity.MILD})
+
+        workouts = list(coach.iter_weekly_workouts(impact))
+
+        assert [plan["week"] for plan in workouts] == list(range(1, 53))
+        assert coach.builds == list(WorkoutPhase)
+
+    def test_exercise_catalog_matches_library(self, coach_agent):
+        library = {name: entry for exercises in coach_agent.exercise_library.values() for name, entry in exercises.items()}
+
+        assert list(EXERCISE_CATALOG) == list(library)
+        assert all(EXERCISE_CATALOG[name].description == entry["description"] for name, entry in library.items())
+        assert EXERCISE_CATALOG["abdominal_breathing"].contraindications == frozenset()
+        assert EXERCISE_CATALOG["standing_meditation"].contraindications == {BodyPart.LEFT_CALF}
+        assert EXERCISE_CATALOG["ward_off"].contraindications == {
+            BodyPart.LEFT_SHOULDER, BodyPart.RIGHT_SHOULDER, BodyPart.LEFT_CALF, BodyPart.LOWER_BACK
+        }
+
+    @pytest.mark.parametrize("phase, week", [
+        (WorkoutPhase.FOUNDATION, 3), (WorkoutPhase.BUILDING, 15),
+        (WorkoutPhase.INTEGRATION, 30), (WorkoutPhase.MASTERY, 40)
+    ])
+    def test_session_exercises_resolve_for_every_phase(self, coach_agent, phase, week):
+        impact = coach_agent.analyze_injury_impact({BodyPart.LOWER_BACK: InjurySeverity.MILD})
+        plan = coach_agent.generate_workout_plan(phase, impact, week)
+        session = WorkoutSession(phase, week, plan["duration_minutes"],
+                                 tuple(exercise["name"] for exercise in plan["exercises"]))
+
+        resolved = session.resolved_exercises
+
+        assert [exercise.name for exercise in resolved] == list(session.exercises)
+        assert all(exercise is EXERCISE_CATALOG[exercise.name] for exercise in resolved)
+
+    def test_cached_workout_plan_round_trips(self, coach_agent, tmp_path):
+        injuries = {BodyPart.RIGHT_SHOULDER: InjurySeverity.MILD, BodyPart.LOWER_BACK: InjurySeverity.MODERATE}
+
+        generated = cached_workout_plan(coach_agent, WorkoutPhase.MASTERY, 40, injuries, cache_dir=tmp_path)
+        reloaded = cached_workout_plan(coach_agent, WorkoutPhase.MASTERY, 40, injuries, cache_dir=tmp_path)
+
+        assert len(list(tmp_path.glob("*.json"))) == 1
+        assert reloaded is not generated
+        assert reloaded == generated
+        assert reloaded["phase"] is WorkoutPhase.MASTERY
+
+    def test_cached_workout_plan_is_not_shared_between_coach_classes(self, coach_agent, tmp_path):
+        class LongSessionCoach(TaiChiCoachAgent):
+            def _calculate_optimal_duration(self, phase, week, injury_impact):
+                return 42
+
+        base = cached_workout_plan(coach_agent, WorkoutPhase.FOUNDATION, 5, {}, cache_dir=tmp_path)
+        subclass = cached_workout_plan(LongSessionCoach(), WorkoutPhase.FOUNDATION, 5, {}, cache_dir=tmp_path)
+
+        assert base["duration_minutes"] != 42
+        assert subclass["duration_minutes"] == 42
+        assert len(list(tmp_path.glob("*.json"))) == 2
+
+    @pytest.mark.parametrize("contents", [b"[]", b"null", b'{"phase": 0, "exercises": 5}', b"not json"])
+    def test_cached_workout_plan_regenerates_malformed_entry(self, coach_agent, tmp_path, contents):
+        injuries = {BodyPart.LEFT_CALF: InjurySeverity.MILD}
+        generated = cached_workout_plan(coach_agent, WorkoutPhase.BUILDING, 6, injuries, cache_dir=tmp_path)
+        (entry,) = tmp_path.glob("*.json")
+        entry.write_bytes(contents)
+
+        assert cached_workout_plan(coach_agent, WorkoutPhase.BUILDING, 6, injuries, cache_dir=tmp_path) == generated
+
+    def test_cached_workout_plan_removes_temp_file_on_failed_write(self, coach_agent, tmp_path, monkeypatch):
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "replace", fail_replace)
+        plan = cached_workout_plan(coach_agent, WorkoutPhase.FOUNDATION, 2, {}, cache_dir=tmp_path)
+
+        assert plan["week"] == 2
+        assert list(tmp_path.iterdir()) == []
+
 
 class TestProgressTrackerAgent:
-    def test_session_recording(self):
-        tracker = ProgressTrackerAgent()
+    def test_session_recording(self, tracker):
         session_data = {
             "phase": WorkoutPhase.FOUNDATION,
             "week": 1,
@@ -58,10 +248,71 @@ class TestProgressTrackerAgent:
         
         tracker.record_session(session_data)
         assert len(tracker.progress_data) == 1
-    
-    def test_trend_analysis(self):
-        tracker = ProgressTrackerAgent()
-        
+
+    def test_dataframe_keeps_metric_values_exactly(self, tracker):
+        base = {"phase": WorkoutPhase.FOUNDATION, "week": 1, "duration_minutes": 15, "completion_percentage": 90}
+        tracker.record_session({**base, "pain_level": 6.5, "fatigue_level": 300})
+        tracker.record_session({**base, "pain_level": 2, "fatigue_level": 4})
+
+        df = tracker.to_dataframe()
+
+        assert df["pain_level"].tolist() == [6.5, 2.0]
+        assert df["pain_level"].dtype == "float64"
+        assert df["fatigue_level"].tolist() == [300, 4]
+        assert df["fatigue_level"].dtype == "int64"
+        assert df["completion_percentage"].dtype == "int64"
+
+    def test_out_of_scale_side_columns_are_kept(self, tracker):
+        session = {"phase": WorkoutPhase.MASTERY, "week": 40000, "duration_minutes": 30, "mood_level": 200,
+                   "exercises": [None] * 300}
+        tracker.record_session(session)
+        tracker.record_sessions([{**session, "mood_level": 7.5}])
+
+        df = tracker.to_dataframe()
+
+        assert df["week"].tolist() == [40000, 40000]
+        assert df["mood_level"].tolist() == [200.0, 7.5]
+        assert df["exercises_completed"].tolist() == [300, 300]
+
+    def test_session_recording_beyond_capacity(self):
+        tracker = ProgressTrackerAgent(initial_capacity=2)
+
+        for i in range(5):
+            tracker.record_session({
+                "phase": WorkoutPhase.FOUNDATION,
+                "week": i + 1,
+                "duration_minutes": 15,
+                "pain_level": i,
+                "completion_percentage": 90
+            })
+
+        data = tracker.to_dataframe()
+        assert len(data) == 5
+        assert list(data["pain_level"]) == [0, 1, 2, 3, 4]
+
+    def test_batch_recording_matches_single_recording(self):
+        sessions = [
+            {
+                "phase": WorkoutPhase.FOUNDATION,
+                "week": i + 1,
+                "duration_minutes": 10 + i,
+                "pain_level": (i * 3) % 7,
+                "fatigue_level": i % 5,
+                "completion_percentage": 100 - i * 4
+            }
+            for i in range(10)
+        ]
+        single = ProgressTrackerAgent(initial_capacity=4)
+        for session in sessions:
+            single.record_session(session)
+        batch = ProgressTrackerAgent(initial_capacity=4)
+        batch.record_sessions(sessions[:3])
+        batch.record_sessions(sessions[3:])
+
+        assert batch.analyze_trends() == single.analyze_trends()
+        assert batch.session_count == single.session_count == 10
+
+    def test_trend_analysis(self, tracker):
         # Add some test data
         for i in range(5):
             session_data = {
@@ -81,35 +332,77 @@ class TestProgressTrackerAgent:
         assert "recommendations" in analysis
         assert isinstance(analysis["recommendations"], list)
 
+    def test_trend_analysis_is_reused_until_next_session(self, tracker):
+        session_data = {"phase": WorkoutPhase.FOUNDATION, "week": 1, "duration_minutes": 10, "pain_level": 2}
+        tracker.record_session(session_data)
+
+        first = tracker.analyze_trends()
+        assert tracker.analyze_trends() is first
+
+        tracker.record_session(dict(session_data, week=2, pain_level=5))
+        second = tracker.analyze_trends()
+        assert second is not first
+        assert second["performance_metrics"]["avg_pain"] == 3.5
+
 
 class TestSafetyMonitorAgent:
-    def test_safety_assessment(self):
-        monitor = SafetyMonitorAgent()
+    def test_safety_assessment(self, safety_monitor):
         session_data = {
             "pain_level": 3,
             "fatigue_level": 4,
             "completion_percentage": 95
         }
         
-        assessment = monitor.assess_session_safety(session_data)
+        assessment = safety_monitor.assess_session_safety(session_data)
         
         assert "safety_level" in assessment
         assert "immediate_actions" in assessment
         assert assessment["clearance_for_next_session"] is True
     
-    def test_high_pain_safety_check(self):
-        monitor = SafetyMonitorAgent()
+    def test_high_pain_safety_check(self, safety_monitor):
         session_data = {
             "pain_level": 8,  # High pain level
             "fatigue_level": 3,
             "completion_percentage": 60
         }
         
-        assessment = monitor.assess_session_safety(session_data)
+        assessment = safety_monitor.assess_session_safety(session_data)
         
         assert assessment["safety_level"] == "red"
         assert assessment["clearance_for_next_session"] is False
 
+    def test_fractional_and_large_levels_are_kept_exactly(self, safety_monitor):
+        for pain in (6.2, 6.5, 6.8):
+            assessment = safety_monitor.assess_session_safety({"pain_level": pain})
+        assert "INCREASING_PAIN_TREND" in assessment["risk_factors"]
+
+        assessment = safety_monitor.assess_session_safety({"pain_level": 200, "fatigue_level": 300})
+        assert assessment["safety_level"] == "red"
+
+        batch = SafetyMonitorAgent().assess_sessions_batch(
+            [{"pain_level": pain} for pain in (6.2, 6.5, 6.8)] + [{"pain_level": 200, "fatigue_level": 300}]
+        )
+        assert "INCREASING_PAIN_TREND" in batch[2]["risk_factors"]
+        assert batch[3]["safety_level"] == "red"
+
+    def test_batch_assessment_matches_single_assessment(self):
+        sessions = [
+            {"pain_level": pain, "fatigue_level": fatigue, "completion_percentage": completion}
+            for pain, fatigue, completion in [
+                (1, 6, 90), (2, 7, 40), (5, 8, 80), (4, 9, 95), (6, 3, 30),
+                (8, 6, 70), (9, 6, 60), (2, 6, 100), (3, 2, 45), (4, 8, 85)
+            ]
+        ]
+        single = SafetyMonitorAgent()
+        expected = [single.assess_session_safety(session) for session in sessions]
+
+        batch = SafetyMonitorAgent()
+        batch.assess_session_safety(sessions[0])
+        reports = [expected[0]] + batch.assess_sessions_batch(sessions[1:4]) + \
+            batch.assess_sessions_batch(sessions[4:])
+
+        assert reports == expected
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,109 @@
+import os
+
+import msgspec
+import pytest
+
+from src.tai_chi_ai.data.models import BodyPart, InjurySeverity
+from src.tai_chi_ai.utils import config_loader
+from src.tai_chi_ai.utils.config_loader import clear_config_cache, load_config, load_injuries
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+
+def write_config(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+class TestLoadConfig:
+    def test_cache_hit_returns_independent_copy(self, tmp_path):
+        path = write_config(tmp_path / "config.yaml", "safety:\n  thresholds: [7, 4]\n")
+
+        first = load_config(path)
+        first["safety"]["thresholds"].append(99)
+        second = load_config(path)
+
+        assert second == {"safety": {"thresholds": [7, 4]}}
+        assert second is not first
+        assert len(config_loader._cache) == 1
+
+    def test_changed_file_is_reparsed(self, tmp_path):
+        path = write_config(tmp_path / "config.yaml", "level: 1\n")
+        assert load_config(path) == {"level": 1}
+
+        write_config(tmp_path / "config.yaml", "level: 10\n")
+        assert load_config(path) == {"level": 10}
+
+        # Same size, newer mtime
+        write_config(tmp_path / "config.yaml", "level: 20\n")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert load_config(path) == {"level": 20}
+
+    def test_least_recently_used_entry_is_evicted(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config_loader, "_CACHE_SIZE", 2)
+        paths = [write_config(tmp_path / f"config{i}.yaml", f"index: {i}\n") for i in range(3)]
+
+        load_config(paths[0])
+        load_config(paths[1])
+        load_config(paths[0])  # paths[1] is now the least recently used
+        load_config(paths[2])
+
+        assert list(config_loader._cache) == [os.path.abspath(paths[0]), os.path.abspath(paths[2])]
+
+    def test_empty_file_returns_empty_dict(self, tmp_path):
+        path = write_config(tmp_path / "empty.yaml", "")
+
+        assert load_config(path) == {}
+
+
+class TestLoadInjuries:
+    def test_yaml_file(self, tmp_path):
+        path = write_config(tmp_path / "injuries.yaml", "injuries:\n  left_shoulder: moderate\n  lower_back: mild\n")
+
+        assert load_injuries(path).injury_map() == {
+            BodyPart.LEFT_SHOULDER: InjurySeverity.MODERATE,
+            BodyPart.LOWER_BACK: InjurySeverity.MILD
+        }
+
+    def test_json_file(self, tmp_path):
+        path = write_config(tmp_path / "injuries.json", '{"injuries": {"neck": "severe", "hips": "mild"}}')
+
+        injuries = load_injuries(path).injury_map()
+
+        assert injuries == {BodyPart.NECK: InjurySeverity.SEVERE, BodyPart.HIPS: InjurySeverity.MILD}
+        assert list(injuries) == [BodyPart.NECK, BodyPart.HIPS]
+
+    def test_example_config(self):
+        path = os.path.join(os.path.dirname(__file__), os.pardir, "config", "injuries.yaml")
+
+        assert len(load_injuries(path).injury_map()) == 4
+
+    @pytest.mark.parametrize("name, text", [
+        ("bad_part.yaml", "injuries:\n  left_elbow: mild\n"),
+        ("bad_severity.yaml", "injuries:\n  neck: agonising\n"),
+        ("bad_part.json", '{"injuries": {"left_elbow": "mild"}}')
+    ])
+    def test_unknown_label_is_rejected(self, tmp_path, name, text):
+        path = write_config(tmp_path / name, text)
+
+        with pytest.raises(msgspec.ValidationError):
+            load_injuries(path)
+
+    @pytest.mark.parametrize("name, text", [
+        ("misspelled.yaml", "injuires:\n  left_shoulder: mild\n"),
+        ("bare_mapping.yaml", "left_shoulder: mild\n"),
+        ("empty.yaml", ""),
+        ("misspelled.json", '{"injuires": {"left_shoulder": "mild"}}'),
+        ("empty.json", "{}")
+    ])
+    def test_missing_injuries_key_is_rejected(self, tmp_path, name, text):
+        path = write_config(tmp_path / name, text)
+
+        with pytest.raises(msgspec.ValidationError):
+            load_injuries(path)
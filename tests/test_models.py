@@ -0,0 +1,19 @@
+import pytest
+
+from src.tai_chi_ai.data.models import BodyPart, InjurySeverity, WorkoutPhase
+
+
+class TestLabelledEnum:
+    def test_labels_in_strings(self):
+        assert str(BodyPart.LEFT_SHOULDER) == "left_shoulder"
+        assert f"{InjurySeverity.MODERATE}" == "moderate"
+        assert f"{WorkoutPhase.MASTERY:s}" == "mastery"
+        assert f"{BodyPart.NECK:>6}|" == "  neck|"
+
+    @pytest.mark.parametrize("spec", ["d", "03d", "x", ".1f", "%"])
+    def test_numeric_specs_format_the_value(self, spec):
+        assert format(BodyPart.NECK, spec) == format(BodyPart.NECK.value, spec)
+
+    def test_labels_are_accepted_as_values(self):
+        assert BodyPart("lower_back") is BodyPart.LOWER_BACK
+        assert InjurySeverity(InjurySeverity.SEVERE.value) is InjurySeverity.SEVERE